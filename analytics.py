@@ -0,0 +1,145 @@
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete, insert, func
+from models import (db, Order, OrderItem, Medicine, StoreDailySales, MedicineDailySales,
+                    CategoryDailySales)
+from db_utils import upsert_increment
+
+# --- Sales Analytics ---
+# Daily rollups are adjusted in the same transaction as the order write (place_order,
+# cancellations in update_order_status), so a report for N days reads at most N rows
+# per store instead of aggregating Order/OrderItem history.
+
+REPORT_WINDOWS = (30, 90, 365)
+TOP_SELLERS = 10
+
+
+def record_order_sales(order, lines, sign=1):
+    """Adds (sign=1) or removes (sign=-1) one order from the rollups; caller commits.
+
+    lines are (medicine_id, medicine_name, category_id, quantity, price) tuples;
+    category_id may be None for medicines that have since been deleted.
+    """
+    if order.store_manager_id is None:
+        return
+    day = order.order_date.date()
+    store = order.store_manager_id
+
+    upsert_increment(StoreDailySales, {'store_manager_id': store, 'day': day},
+                     {'orders': sign, 'units': sign * sum(line[3] for line in lines),
+                      'revenue': sign * order.total_amount})
+
+    categories = {}
+    for medicine_id, name, category_id, quantity, price in lines:
+        upsert_increment(MedicineDailySales, {'store_manager_id': store, 'day': day, 'medicine_id': medicine_id},
+                         {'units': sign * quantity, 'revenue': sign * quantity * price}, {'medicine_name': name})
+        if category_id is not None:
+            units, revenue = categories.get(category_id, (0, 0))
+            categories[category_id] = (units + quantity, revenue + quantity * price)
+
+    for category_id, (units, revenue) in categories.items():
+        upsert_increment(CategoryDailySales, {'store_manager_id': store, 'day': day, 'category_id': category_id},
+                         {'units': sign * units, 'revenue': sign * revenue})
+
+
+def order_lines(order_id):
+    """Sale lines of a stored order, with each medicine's current category."""
+    return db.session.execute(
+        select(OrderItem.medicine_id, OrderItem.medicine_name, Medicine.category_id, OrderItem.quantity, OrderItem.price)
+        .outerjoin(Medicine, Medicine.id == OrderItem.medicine_id)
+        .where(OrderItem.order_id == order_id)
+    ).all()
+
+
+def sales_report(store_manager_id, days):
+    """Revenue, daily series, top sellers and category split for the last `days` days."""
+    since = datetime.utcnow().date() - timedelta(days=days - 1) # Rollup days come from order_date, which is UTC
+
+    daily = db.session.execute(
+        select(StoreDailySales.day, StoreDailySales.orders, StoreDailySales.units, StoreDailySales.revenue)
+        .where(StoreDailySales.store_manager_id == store_manager_id, StoreDailySales.day >= since)
+        .order_by(StoreDailySales.day)
+    ).all()
+
+    top = db.session.execute(
+        select(MedicineDailySales.medicine_id, func.max(MedicineDailySales.medicine_name),
+               func.sum(MedicineDailySales.units), func.sum(MedicineDailySales.revenue).label('revenue'))
+        .where(MedicineDailySales.store_manager_id == store_manager_id, MedicineDailySales.day >= since)
+        .group_by(MedicineDailySales.medicine_id)
+        .having(func.sum(MedicineDailySales.units) > 0)
+        .order_by(func.sum(MedicineDailySales.revenue).desc())
+        .limit(TOP_SELLERS)
+    ).all()
+
+    categories = db.session.execute(
+        select(CategoryDailySales.category_id, func.sum(CategoryDailySales.units), func.sum(CategoryDailySales.revenue))
+        .where(CategoryDailySales.store_manager_id == store_manager_id, CategoryDailySales.day >= since)
+        .group_by(CategoryDailySales.category_id)
+        .having(func.sum(CategoryDailySales.units) > 0)
+        .order_by(func.sum(CategoryDailySales.revenue).desc())
+    ).all()
+
+    return {
+        'days': days,
+        'since': since.isoformat(),
+        'orders': sum(row.orders for row in daily),
+        'units': sum(row.units for row in daily),
+        'revenue': round(sum(row.revenue for row in daily), 2),
+        'daily': [{'day': row.day.isoformat(), 'orders': row.orders, 'units': row.units,
+                   'revenue': round(row.revenue, 2)} for row in daily],
+        'top_sellers': [{'medicine_id': med_id, 'name': name, 'units': units, 'revenue': round(revenue, 2)}
+                        for med_id, name, units, revenue in top],
+        'categories': [{'category_id': cat_id, 'units': units, 'revenue': round(revenue, 2)}
+                       for cat_id, units, revenue in categories]
+    }
+
+
+def backfill_sales_rollups(store_ids=None):
+    """Rebuilds the rollups from order history (cancelled orders excluded) with INSERT ... SELECT.
+
+    store_ids limits the rebuild to those stores; other stores' rollups are left alone.
+    """
+    started = time.perf_counter()
+    day = func.date(Order.order_date)
+    live = [Order.status != 'Cancelled', Order.store_manager_id.isnot(None)]
+    if store_ids is not None:
+        live.append(Order.store_manager_id.in_(store_ids))
+
+    for model in (StoreDailySales, MedicineDailySales, CategoryDailySales):
+        stmt = delete(model)
+        if store_ids is not None:
+            stmt = stmt.where(model.store_manager_id.in_(store_ids))
+        db.session.execute(stmt)
+
+    item_units = (select(OrderItem.order_id, func.sum(OrderItem.quantity).label('units'))
+                  .group_by(OrderItem.order_id).subquery())
+    db.session.execute(insert(StoreDailySales).from_select(
+        ['store_manager_id', 'day', 'orders', 'units', 'revenue'],
+        select(Order.store_manager_id, day, func.count(Order.id), func.coalesce(func.sum(item_units.c.units), 0),
+               func.sum(Order.total_amount))
+        .outerjoin(item_units, item_units.c.order_id == Order.id)
+        .where(*live).group_by(Order.store_manager_id, day)
+    ))
+
+    db.session.execute(insert(MedicineDailySales).from_select(
+        ['store_manager_id', 'day', 'medicine_id', 'medicine_name', 'units', 'revenue'],
+        select(Order.store_manager_id, day, OrderItem.medicine_id, func.max(OrderItem.medicine_name),
+               func.sum(OrderItem.quantity), func.sum(OrderItem.quantity * OrderItem.price))
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .where(*live).group_by(Order.store_manager_id, day, OrderItem.medicine_id)
+    ))
+
+    db.session.execute(insert(CategoryDailySales).from_select(
+        ['store_manager_id', 'day', 'category_id', 'units', 'revenue'],
+        select(Order.store_manager_id, day, Medicine.category_id,
+               func.sum(OrderItem.quantity), func.sum(OrderItem.quantity * OrderItem.price))
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .join(Medicine, Medicine.id == OrderItem.medicine_id)
+        .where(*live).group_by(Order.store_manager_id, day, Medicine.category_id)
+    ))
+
+    db.session.commit()
+    return {
+        'store_days': db.session.query(func.count()).select_from(StoreDailySales).scalar(),
+        'seconds': time.perf_counter() - started
+    }
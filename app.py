@@ -1,12 +1,30 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask import Flask, render_template, request, redirect, url_for, flash, session, Response, stream_with_context, abort, jsonify, make_response
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
-from models import db, User, Medicine, Category, Order, OrderItem, CustomerQuery
+from models import db, User, Medicine, Category, Order, OrderItem, CartItem, CustomerQuery, StarterSeed, NearExpiryItem, summarize_order_items
 import os
+import io
 import hashlib
+import click
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 from medicines_data import REAL_MEDICINES_DB
+from cart_utils import (hydrate_cart, reserve_stock, cart_quantities, add_cart_item, remove_cart_item, clear_cart,
+                        merge_cart, set_cart_quantity, cart_summary)
+from search_index import apply_search, get_search_backend
+from cache_utils import VersionedCache, VersionedKeyCache, VersionCounter, CATALOG_VERSION
+from symptom_matcher import KeywordMatcher
+from pagination import paginate_keyset, paginate_ranked, page_size_arg
+from expiry_sweeper import sweep_expiry, start_expiry_sweeper
+from inventory_import import import_medicines, guess_format, IMPORT_FIELDS
+from exports import export_medicines, export_orders
+from perf_monitor import init_perf_monitor
+from analytics import record_order_sales, order_lines, sales_report, backfill_sales_rollups, REPORT_WINDOWS
+from collections import namedtuple
+from functools import lru_cache, wraps
+from sqlalchemy import select, insert, update, delete, func, case, and_, true
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, contains_eager
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'dev-secret-key-change-this' # Change for production
@@ -25,18 +43,27 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 db.init_app(app)
 
-with app.app_context():
-    db.create_all()
 login_manager = LoginManager()
 login_manager.login_view = 'login'
 login_manager.init_app(app)
 
+# Opt-in request instrumentation (query counts, DB time, /__perf summary).
+# Registered first so its timer wraps every other request hook.
+if os.getenv('PERF_MONITOR') == '1':
+    init_perf_monitor(app, slow_ms=float(os.getenv('PERF_SLOW_MS', 500)),
+                      max_queries=int(os.getenv('PERF_MAX_QUERIES', 20)))
+
 # --- Template Filters ---
 @app.template_filter('parse_formulation')
 def parse_formulation_filter(text):
     if not text:
         return {}
-    
+    return parse_formulation(text)
+
+# Compositions rarely change, so every card after the first render is a cache hit.
+# Results are shared between callers: treat them as read-only.
+@lru_cache(maxsize=4096)
+def parse_formulation(text):
     sections = {'ingredients': [], 'excipients': [], 'use': []}
     lines = [line.strip() for line in text.splitlines() if line.strip()]
     current_key = None
@@ -66,11 +93,88 @@ def parse_formulation_filter(text):
             # Fallback for medicines with no headers - treat first lines as ingredients
             sections['ingredients'].append(line)
             
-    return sections
+    return {key: tuple(values) for key, values in sections.items()}
+
+def load_user_row(user_id):
+    user = db.session.get(User, user_id)
+    if user:
+        # Detach so later commits in this request can't expire the shared cached copy
+        db.session.expunge(user)
+    return user
+
+# Logged-in users by id, so most requests skip the user SELECT.
+# Call user_cache.invalidate(user.id) before committing a role/store_id change.
+user_cache = VersionedKeyCache('users', load_user_row, ttl=int(os.getenv('USER_CACHE_TTL', 30)))
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return user_cache.get(int(user_id))
+
+# --- Pagination Links ---
+def pager_urls(page, param='cursor'):
+    """Next/first page links for the current URL, keeping every other query arg."""
+    # Names starting with "_" would collide with url_for's own options (_external, _anchor, ...)
+    args = {k: v for k, v in request.args.items() if not k.startswith('_')}
+    current = args.pop(param, None)
+    return {
+        'next_url': url_for(request.endpoint, **args, **{param: page.next_cursor}) if page.next_cursor else None,
+        'first_url': url_for(request.endpoint, **args) if current else None
+    }
+
+# --- Category Cache ---
+CategoryRow = namedtuple('CategoryRow', ['id', 'name'])
+
+def load_categories():
+    return [CategoryRow(c.id, c.name) for c in db.session.query(Category.id, Category.name).order_by(Category.id)]
+
+# Nav/sidebar categories, shared across requests; add_category/seed_database invalidate it
+category_cache = VersionedCache('categories', load_categories, ttl=int(os.getenv('CATEGORY_CACHE_TTL', 60)))
+
+# --- Catalog HTTP Caching ---
+# Anonymous /medicines and /healthcare pages depend only on the URL, the catalog and the
+# date (expiry badges), so they carry a strong ETag derived from the shared catalog
+# version. A matching If-None-Match is answered 304 before any catalog query or render.
+# Every write that changes what those pages show calls catalog_version.bump(); other
+# workers notice within CATALOG_VERSION_TTL seconds.
+LOW_STOCK_LEVEL = 10 # Catalog cards show "Only N left!" at or below this quantity
+app.jinja_env.globals['LOW_STOCK_LEVEL'] = LOW_STOCK_LEVEL # Same threshold in the templates and the bump rule
+
+catalog_version = VersionCounter(CATALOG_VERSION, ttl=float(os.getenv('CATALOG_VERSION_TTL', 2)))
+
+@lru_cache(maxsize=1)
+def template_fingerprint():
+    """Hash of the templates, so a deploy that changes the markup never matches old ETags."""
+    digest = hashlib.sha1()
+    folder = os.path.join(app.root_path, app.template_folder)
+    for name in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, name), 'rb') as f:
+            digest.update(name.encode() + f.read())
+    return digest.hexdigest()
+
+def catalog_etag():
+    """ETag for the current catalog page, or None when it is personalised (logged in, pending flashes)."""
+    if current_user.is_authenticated or '_flashes' in session:
+        return None
+    key = f"{catalog_version.get()}|{date.today().isoformat()}|{template_fingerprint()}|{request.full_path}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def conditional_catalog_page(view):
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        etag = catalog_etag()
+        if etag is None:
+            return view(*args, **kwargs)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'public, no-cache' # Always revalidate; shared caches may keep a copy
+        response.vary.add('Cookie') # Logged-in customers get a different page at the same URL
+        return response
+    return wrapped
 
 # --- Seeding Logic ---
 def seed_database():
@@ -78,8 +182,26 @@ def seed_database():
     print("Checking initial data...")
 
     print("Seeding database...")
+
+    # 1. Create Categories (first, so the default manager's starter stock can find them)
+    categories = [
+        "Must Haves", "Pain Relief", "Cold & Flu", "Vitamins", "First Aid", "Digestion", "General Health",
+        "Skin Care", "Sexual Wellness", "Personal Care", "Winter Store",
+        "Health Concerns", "Health Food and Drinks",
+        "Heart Care", "Diabetes Essentials", "Ayurvedic Care",
+        "Mother and Baby Care", "Mobility & Elderly Care", "Sports Nutrition",
+        "Healthcare Devices"
+    ]
     
-    # 1. Create Default Store Manager (virat)
+    existing = {name for (name,) in db.session.query(Category.name).filter(Category.name.in_(categories))}
+    missing = [name for name in categories if name not in existing]
+    if missing:
+        db.session.add_all([Category(name=name) for name in missing])
+        category_cache.invalidate()
+        catalog_version.bump()
+    db.session.commit()
+
+    # 2. Create Default Store Manager (virat)
     virat = User.query.filter_by(username='virat').first()
     if not virat:
         virat = User(
@@ -95,66 +217,107 @@ def seed_database():
         # Seed medicines for virat immediately
         seed_starter_data(virat.id)
 
-
-    # 2. Create Categories
-    categories = [
-        "Must Haves", "Pain Relief", "Cold & Flu", "Vitamins", "First Aid", "Digestion", "General Health",
-        "Skin Care", "Sexual Wellness", "Personal Care", "Winter Store",
-        "Health Concerns", "Health Food and Drinks",
-        "Heart Care", "Diabetes Essentials", "Ayurvedic Care",
-        "Mother and Baby Care", "Mobility & Elderly Care", "Sports Nutrition",
-        "Healthcare Devices"
-    ]
-    
-    for name in categories:
-        if not Category.query.filter_by(name=name).first():
-            db.session.add(Category(name=name))
-    
-    db.session.commit()
     print("Database seeded successfully!")
 
 def seed_starter_data(user_id):
-    """Injects starter medicines for a new store manager."""
+    """Injects starter medicines for a new store manager (once, in a single bulk insert)."""
     try:
-        user = User.query.get(user_id)
-        if Medicine.query.filter_by(user_id=user.id).count() > 0:
+        # Managers who already stock medicines, or were seeded before, are left alone
+        if db.session.query(Medicine.id).filter_by(user_id=user_id).first():
+            return
+        if db.session.get(StarterSeed, user_id):
             return
 
-        print(f"Seeding starter data for {user.username}...")
-        
+        category_ids = dict(db.session.query(Category.name, Category.id))
+        expiry = datetime.today().date() + timedelta(days=365) # Default 1 year expiry
+
+        rows = [{
+            'name': item['name'],
+            'price': item['price'],
+            'quantity': 50, # Default Quantity
+            'medicine_type': item['type'],
+            'category_id': category_ids[item['cat']],
+            'user_id': user_id,
+            'expiry_date': expiry,
+            'unit': item['unit'],
+            'availability': True
+        } for item in REAL_MEDICINES_DB if item['cat'] in category_ids]
+        if not rows:
+            return
 
+        print(f"Seeding starter data for manager #{user_id}...")
 
-        starter_meds = REAL_MEDICINES_DB
-        
-        today = datetime.today().date()
-        expiry = today + timedelta(days=365) # Default 1 year expiry
-
-        for item in starter_meds:
-            cat = Category.query.filter_by(name=item['cat']).first()
-            if not cat: continue 
-
-            new_med = Medicine(
-                name=item['name'], 
-                price=item['price'], 
-                quantity=50, # Default Quantity
-                medicine_type=item['type'], 
-                category_id=cat.id, 
-                user_id=user.id,
-                expiry_date=expiry, 
-                unit=item['unit']
-            )
-            db.session.add(new_med)
-            
+        # Claim the seed first: a concurrent login for the same manager fails on this
+        # primary key and rolls back instead of inserting a second copy
+        db.session.add(StarterSeed(user_id=user_id))
+        db.session.flush()
+        db.session.execute(insert(Medicine), rows)
+        catalog_version.bump()
         db.session.commit()
-        print(f"Starter data seeded: {len(starter_meds)} medicines.")
+        print(f"Starter data seeded: {len(rows)} medicines.")
 
+    except IntegrityError:
+        db.session.rollback() # Another request seeded this store first
     except Exception as e:
         print(f"Error seeding data: {e}")
         db.session.rollback()
 
-with app.app_context():
+def init_db():
+    """Creates tables, seeds default data and installs the search index (idempotent)."""
     db.create_all()
     seed_database()
+    get_search_backend() # Create FTS index + sync triggers up front
+
+@app.cli.command('init-db')
+def init_db_command():
+    """One-time schema/seed step: flask --app app init-db"""
+    init_db()
+
+# Importing app touches no database by default, so workers, scripts and serverless
+# cold starts boot fast. Set AUTO_INIT_DB=1 where there is no separate release step.
+if os.getenv('AUTO_INIT_DB') == '1':
+    with app.app_context():
+        init_db()
+
+@app.cli.command('sweep-expiry')
+def sweep_expiry_command():
+    """Marks expired stock unavailable and rebuilds the near-expiry worklist (run from cron)."""
+    result = sweep_expiry()
+    print(f"Marked {result['expired_marked']} expired medicines unavailable; "
+          f"{result['worklist_rows']} on the near-expiry worklist ({result['seconds'] * 1000:.0f} ms).")
+
+@app.cli.command('import-medicines')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--store', 'username', required=True, help='Username of the store manager receiving the stock.')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None, help='Defaults to the file extension.')
+@click.option('--batch-size', default=1000, show_default=True)
+def import_medicines_command(path, username, fmt, batch_size):
+    """Bulk-imports a CSV / JSON Lines inventory file: flask --app app import-medicines stock.csv --store virat"""
+    manager = User.query.filter_by(username=username, role='store_manager').first()
+    if not manager:
+        raise click.ClickException(f"No store manager named {username!r}")
+
+    def progress(inserted, updated, rejected, seconds):
+        done = inserted + updated + rejected
+        print(f"  {done} rows ({done / seconds:.0f} rows/s)")
+
+    with open(path, newline='', encoding='utf-8-sig') as stream:
+        result = import_medicines(stream, fmt or guess_format(path), manager.id, batch_size, progress)
+    print(f"Imported {result.inserted} new and {result.updated} updated medicines, "
+          f"rejected {result.rejected} rows in {result.seconds:.1f}s.")
+    for error in result.errors:
+        print(f"  {error}")
+
+@app.cli.command('backfill-analytics')
+def backfill_analytics_command():
+    """Rebuilds the daily sales rollups from existing orders: flask --app app backfill-analytics"""
+    result = backfill_sales_rollups()
+    print(f"Sales rollups rebuilt: {result['store_days']} store-days in {result['seconds'] * 1000:.0f} ms.")
+
+# Optional in-process schedule for deployments without cron: EXPIRY_SWEEP_INTERVAL=<seconds>
+# Every worker runs its own sweeper thread; sweep_expiry() serializes them.
+if os.getenv('EXPIRY_SWEEP_INTERVAL'):
+    start_expiry_sweeper(app, int(os.getenv('EXPIRY_SWEEP_INTERVAL')))
 
 # --- Routes ---
 
@@ -272,6 +435,39 @@ def forgot_password():
         return redirect(url_for('login'))
     return render_template('forgot_password.html')
 
+def hide_expired(query):
+    """Drops expired stock from a Medicine query.
+
+    Same rule as Medicine.expiry_status != 'Expired', written against expiry_date
+    so the database can use its index instead of evaluating the CASE per row.
+    """
+    return query.filter(Medicine.expiry_date >= date.today())
+
+def dashboard_stats(manager_id):
+    """Inventory and order counters for one manager, computed by the database in a single query."""
+    def count_if(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    medicine_stats = select(
+        func.count(Medicine.id).label('total'),
+        count_if(and_(Medicine.availability == True, Medicine.quantity > 0)).label('available'),
+        count_if(Medicine.quantity == 0).label('out_of_stock'),
+        count_if(Medicine.expiry_status == 'Expired').label('expired'),
+        count_if(Medicine.expiry_status == 'Near Expiry').label('near_expiry')
+    ).where(Medicine.user_id == manager_id).subquery()
+
+    order_stats = select(
+        func.count(Order.id).label('total_orders'),
+        count_if(Order.status.in_(['Placed', 'Packed'])).label('pending_orders'),
+        count_if(Order.status == 'Delivered').label('delivered_orders')
+    ).where(Order.store_manager_id == manager_id).subquery()
+
+    # Both subqueries return exactly one row, so the cross join is one row too
+    row = db.session.execute(
+        select(medicine_stats, order_stats).select_from(medicine_stats.join(order_stats, true()))
+    ).one()
+    return dict(row._mapping)
+
 @app.route('/dashboard')
 @login_required
 def dashboard():
@@ -279,29 +475,30 @@ def dashboard():
         flash('Access Denied.', 'error')
         return redirect(url_for('index'))
 
-    medicines = Medicine.query.filter_by(user_id=current_user.id).all()
-    categories = Category.query.all()
-    
-    # Orders for this manager
-    orders = Order.query.filter_by(store_manager_id=current_user.id).order_by(Order.order_date.desc()).all()
+    page_size = page_size_arg(request.args.get('per_page'), default=50)
+    medicines_query = Medicine.query.filter_by(user_id=current_user.id).options(joinedload(Medicine.category))
+    medicine_page = paginate_keyset(medicines_query, [Medicine.name, Medicine.id],
+                                    request.args.get('med_cursor'), page_size)
+    categories = category_cache.get()
     
-    total_medicines = len(medicines)
-    available_medicines = len([m for m in medicines if m.availability and m.quantity > 0])
-    out_of_stock = len([m for m in medicines if m.quantity == 0])
+    # Orders for this manager, newest first; rows carry their own item summary
+    orders_query = Order.query.filter_by(store_manager_id=current_user.id)
+    order_page = paginate_keyset(orders_query, [Order.order_date, Order.id],
+                                 request.args.get('order_cursor'), page_size, descending=True)
     
+    # Precomputed by the expiry sweeper; no expiry scan on the request path
+    expiry_worklist = (NearExpiryItem.query.filter_by(user_id=current_user.id)
+                       .order_by(NearExpiryItem.expiry_date).limit(20).all())
+
     return render_template('dashboard.html', 
-                         medicines=medicines, 
+                         medicines=medicine_page.items, 
+                         expiry_worklist=expiry_worklist,
+                         import_fields=IMPORT_FIELDS,
                          categories=categories,
-                         orders=orders,
-                         stats={
-                             'total': total_medicines,
-                             'available': available_medicines,
-                             'out_of_stock': out_of_stock,
-                             'categories': len(categories),
-                             'total_orders': len(orders),
-                             'pending_orders': len([o for o in orders if o.status in ['Placed', 'Packed']]),
-                             'delivered_orders': len([o for o in orders if o.status == 'Delivered'])
-                         })
+                         orders=order_page.items,
+                         medicine_pager=pager_urls(medicine_page, 'med_cursor'),
+                         order_pager=pager_urls(order_page, 'order_cursor'),
+                         stats=dict(dashboard_stats(current_user.id), categories=len(categories)))
 
 @app.route('/logout')
 @login_required
@@ -310,6 +507,55 @@ def logout():
     logout_user()
     return redirect(url_for('login'))
 
+def visible_orders():
+    """Orders the current user may read: their store's orders for managers, their own otherwise."""
+    if current_user.role == 'store_manager':
+        return Order.query.filter_by(store_manager_id=current_user.id)
+    return Order.query.filter_by(user_id=current_user.id)
+
+def order_json(order):
+    return {
+        'id': order.id,
+        'order_date': order.order_date.isoformat(),
+        'status': order.status,
+        'total_amount': order.total_amount,
+        'payment_method': order.payment_method,
+        'full_name': order.full_name,
+        'item_count': order.item_count,
+        'items_summary': order.items_summary
+    }
+
+@app.route('/api/orders')
+@login_required
+def api_orders():
+    """Order history, newest first, one keyset page at a time (?cursor=&per_page=)."""
+    page = paginate_keyset(visible_orders(), [Order.order_date, Order.id], request.args.get('cursor'),
+                           page_size_arg(request.args.get('per_page')), descending=True)
+    return jsonify(orders=[order_json(order) for order in page.items], next_cursor=page.next_cursor)
+
+@app.route('/api/orders/<int:order_id>')
+@login_required
+def api_order_detail(order_id):
+    """Full order with its items and delivery address, loaded on demand."""
+    order = visible_orders().filter_by(id=order_id).first_or_404()
+    data = order_json(order)
+    data['address'] = {field: getattr(order, field) for field in
+                       ['mobile_number', 'address_line1', 'area_landmark', 'city', 'state', 'pincode']}
+    data['items'] = [{'medicine_id': item.medicine_id, 'medicine_name': item.medicine_name,
+                      'quantity': item.quantity, 'price': item.price} for item in order.items]
+    return jsonify(data)
+
+@app.route('/api/analytics')
+@login_required
+def api_analytics():
+    """Sales for the last 30/90/365 days (?days=), answered from the daily rollups."""
+    if current_user.role != 'store_manager':
+        return jsonify(error='Access Denied.'), 403
+    days = request.args.get('days', 30, type=int)
+    if days not in REPORT_WINDOWS:
+        return jsonify(error=f"days must be one of {', '.join(map(str, REPORT_WINDOWS))}"), 400
+    return jsonify(sales_report(current_user.id, days))
+
 @app.route('/update_order_status/<int:order_id>', methods=['POST'])
 @login_required
 def update_order_status(order_id):
@@ -323,27 +569,32 @@ def update_order_status(order_id):
         
     new_status = request.form.get('status')
     if new_status in ['Placed', 'Packed', 'Delivered', 'Cancelled']:
-        order.status = new_status
+        # Cancelling (or reinstating) moves the order out of (or back into) the sales rollups.
+        # The status guard in the UPDATE makes sure two concurrent requests adjust them once.
+        cancelling = new_status == 'Cancelled'
+        crossed = db.session.execute(
+            update(Order)
+            .where(Order.id == order.id, (Order.status == 'Cancelled') != cancelling)
+            .values(status=new_status)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if crossed:
+            record_order_sales(order, order_lines(order.id), sign=-1 if cancelling else 1)
+        else:
+            order.status = new_status
         db.session.commit()
         flash(f'Order #{order.id} status updated to {new_status}.', 'success')
     
     return redirect(url_for('dashboard'))
 
 @app.route('/medicines')
+@conditional_catalog_page
 def medicines():
     search_query = request.args.get('search', '')
     category_filter = request.args.get('category', '')
     type_filter = request.args.get('type', '')
 
-    query = Medicine.query
-    
-    if search_query:
-        query = query.filter(
-            db.or_(
-                Medicine.name.ilike(f'%{search_query}%'),
-                Medicine.composition.ilike(f'%{search_query}%')
-            )
-        )
+    query = Medicine.query.options(joinedload(Medicine.category)) # Cards show the category name
     
     display_title = "Available Medicines"
     if category_filter:
@@ -356,9 +607,21 @@ def medicines():
         
     if current_user.is_authenticated and current_user.role == 'store_manager':
         query = query.filter(Medicine.user_id == current_user.id)
-        
-    meds = query.all()
-    return render_template('medicines.html', medicines=meds, current_category=display_title)
+    else:
+        query = query.filter(Medicine.availability == True) # Expired stock is flagged by the sweeper
+
+    if request.args.get('hide_expired'):
+        query = hide_expired(query)
+
+    cursor = request.args.get('cursor')
+    page_size = page_size_arg(request.args.get('per_page'))
+    if search_query:
+        page = paginate_ranked(apply_search(query, search_query), cursor, page_size)
+    else:
+        page = paginate_keyset(query, [Medicine.name, Medicine.id], cursor, page_size)
+
+    return render_template('medicines.html', medicines=page.items, current_category=display_title,
+                           pager=pager_urls(page))
 
 @app.route('/add_medicine', methods=['POST'])
 @login_required
@@ -384,6 +647,7 @@ def add_medicine():
             user_id=current_user.id
         )
         db.session.add(new_med)
+        catalog_version.bump()
         db.session.commit()
 
         flash('Medicine added successfully', 'success')
@@ -392,6 +656,51 @@ def add_medicine():
         
     return redirect(url_for('dashboard'))
 
+@app.route('/import_medicines', methods=['POST'])
+@login_required
+def import_medicines_upload():
+    if current_user.role != 'store_manager':
+        flash('Access Denied.', 'error')
+        return redirect(url_for('index'))
+
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        flash('Choose a CSV or JSON Lines file to import.', 'error')
+        return redirect(url_for('dashboard'))
+
+    # Decode the upload as a stream so large files are never read into memory at once
+    stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+    try:
+        result = import_medicines(stream, guess_format(upload.filename), current_user.id)
+    except (UnicodeDecodeError, ValueError) as e:
+        db.session.rollback()
+        flash(f'Import failed: {e}', 'error')
+        return redirect(url_for('dashboard'))
+
+    flash(f'Imported {result.inserted} new and {result.updated} updated medicines.', 'success')
+    if result.rejected:
+        flash(f'Skipped {result.rejected} invalid rows: ' + '; '.join(result.errors[:5]), 'error')
+    return redirect(url_for('dashboard'))
+
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+@app.route('/export/<kind>.<fmt>')
+@login_required
+def export_data(kind, fmt):
+    """Streams this manager's medicines or orders (with items) as CSV or NDJSON."""
+    if current_user.role != 'store_manager':
+        flash('Access Denied.', 'error')
+        return redirect(url_for('index'))
+
+    exporters = {'medicines': export_medicines, 'orders': export_orders}
+    if kind not in exporters or fmt not in EXPORT_MIMETYPES:
+        abort(404)
+
+    chunks = exporters[kind](current_user.id, fmt)
+    filename = f"{kind}-{date.today().isoformat()}.{fmt}"
+    return Response(stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[fmt],
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
 @app.route('/delete_medicine/<int:id>')
 @login_required
 def delete_medicine(id):
@@ -400,7 +709,11 @@ def delete_medicine(id):
         flash('Unauthorized action', 'error')
         return redirect(url_for('dashboard'))
         
+    # Rows that reference the medicine go first (foreign keys): customers' carts and the expiry worklist
+    db.session.execute(delete(CartItem).where(CartItem.medicine_id == id))
+    db.session.execute(delete(NearExpiryItem).where(NearExpiryItem.medicine_id == id))
     db.session.delete(med)
+    catalog_version.bump()
     db.session.commit()
     flash('Medicine deleted', 'success')
     return redirect(url_for('dashboard'))
@@ -422,26 +735,32 @@ def update_medicine(id):
     if request.form.get('composition'):
         med.composition = request.form.get('composition')
         
+    catalog_version.bump()
     db.session.commit()
     flash('Medicine updated', 'success')
     return redirect(url_for('dashboard'))
 
+def current_cart():
+    """{medicine_id: quantity} for the logged-in customer; guests have no cart."""
+    return cart_quantities(current_user.id) if current_user.is_authenticated else {}
+
+def cart_badge_count():
+    """Units in the logged-in customer's cart for the nav badge; cart.js keeps it current after that."""
+    return cart_summary(current_user.id)['count'] if current_user.is_authenticated else 0
+
+app.jinja_env.globals['cart_badge_count'] = cart_badge_count
+
+@app.before_request
+def adopt_session_cart():
+    # Carts used to live in the session cookie; move a leftover one into CartItem once
+    if 'cart' in session and current_user.is_authenticated:
+        merge_cart(current_user.id, session.pop('cart') or {})
+        db.session.commit()
+
 @app.route('/cart')
 def cart():
-    cart_session = session.get('cart', {})
-    cart_items = []
-    total_amount = 0
-    
-    # Cart keys are strings in session JSON
-    if cart_session:
-        for med_id, qty in cart_session.items():
-            med = Medicine.query.get(int(med_id))
-            if med:
-                item_total = med.price * qty
-                cart_items.append({'medicine': med, 'quantity': qty, 'total': item_total})
-                total_amount += item_total
-            
-    return render_template('cart.html', cart_items=cart_items, total_amount=total_amount)
+    cart_view = hydrate_cart(current_cart())
+    return render_template('cart.html', cart_items=cart_view.items, total_amount=cart_view.total_amount)
 
 @app.route('/add_to_cart/<int:id>', methods=['POST'])
 def add_to_cart(id):
@@ -449,16 +768,15 @@ def add_to_cart(id):
         flash('Please login to purchase medicines.', 'info')
         return redirect(url_for('login'))
 
-    quantity = int(request.form.get('quantity', 1))
-    cart_session = session.get('cart', {})
-    
-    str_id = str(id)
-    if str_id in cart_session:
-        cart_session[str_id] += quantity
-    else:
-        cart_session[str_id] = quantity
-        
-    session['cart'] = cart_session
+    quantity = int_field(request.form, 'quantity', 1)
+    if quantity is None or quantity < 1:
+        flash('Please choose a quantity of at least 1.', 'error')
+        return redirect(request.referrer or url_for('healthcare'))
+    if db.session.get(Medicine, id) is None:
+        abort(404)
+
+    add_cart_item(current_user.id, id, quantity)
+    db.session.commit()
     
     if request.form.get('action') == 'buy_now':
         return redirect(url_for('checkout'))
@@ -468,36 +786,84 @@ def add_to_cart(id):
 
 @app.route('/remove_from_cart/<int:id>')
 def remove_from_cart(id):
-    cart_session = session.get('cart', {})
-    str_id = str(id)
-    if str_id in cart_session:
-        del cart_session[str_id]
-        session['cart'] = cart_session
+    if current_user.is_authenticated and remove_cart_item(current_user.id, id):
+        db.session.commit()
         flash('Item removed', 'success')
     return redirect(url_for('cart'))
 
+# --- Cart JSON API ---
+# Used by static/js/cart.js so an add-to-cart click is one small request instead of a
+# redirect and a full catalog page build. Every response carries the new cart totals.
+
+def api_login_required(view):
+    """Like login_required, but answers 401 JSON (with the login URL) instead of redirecting."""
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return jsonify(error='Please login to purchase medicines.', login_url=url_for('login')), 401
+        return view(*args, **kwargs)
+    return wrapped
+
+def int_field(data, name, default=None):
+    """Integer value from a JSON body or form; None when missing or not a number."""
+    try:
+        return int(data.get(name, default))
+    except (TypeError, ValueError):
+        return None
+
+@app.route('/api/cart')
+@api_login_required
+def api_cart():
+    return jsonify(cart_summary(current_user.id))
+
+@app.route('/api/cart/items', methods=['POST'])
+@api_login_required
+def api_cart_add():
+    """Adds {medicine_id, quantity} (JSON or form fields) to the cart."""
+    data = request.get_json(silent=True) or request.form
+    medicine_id, quantity = int_field(data, 'medicine_id'), int_field(data, 'quantity', 1)
+    if medicine_id is None or quantity is None or quantity < 1:
+        return jsonify(error='medicine_id and a positive quantity are required.'), 400
+    if db.session.get(Medicine, medicine_id) is None:
+        return jsonify(error='Medicine not found.'), 404
+
+    add_cart_item(current_user.id, medicine_id, quantity)
+    db.session.commit()
+    return jsonify(**cart_summary(current_user.id), message='Item added to cart!')
+
+@app.route('/api/cart/items/<int:medicine_id>', methods=['PATCH', 'DELETE'])
+@api_login_required
+def api_cart_item(medicine_id):
+    """PATCH {quantity} sets a line's quantity (0 removes it); DELETE removes the line."""
+    if request.method == 'DELETE':
+        remove_cart_item(current_user.id, medicine_id)
+        message = 'Item removed'
+    else:
+        quantity = int_field(request.get_json(silent=True) or request.form, 'quantity')
+        if quantity is None or quantity < 0:
+            return jsonify(error='quantity must be a number of 0 or more.'), 400
+        if not set_cart_quantity(current_user.id, medicine_id, quantity):
+            return jsonify(error='Item is not in your cart.'), 404
+        message = 'Cart updated'
+    db.session.commit()
+    return jsonify(**cart_summary(current_user.id), message=message)
+
 @app.route('/checkout')
 def checkout():
-    cart_session = session.get('cart', {})
-    if not cart_session:
+    cart_view = hydrate_cart(current_cart())
+    if not cart_view.items:
         flash('Cart is empty', 'warning')
         return redirect(url_for('index'))
-         
-    cart_items = []
-    total_amount = 0
-    for med_id, qty in cart_session.items():
-        med = Medicine.query.get(int(med_id))
-        if med:
-            cart_items.append({'medicine': med, 'quantity': qty, 'total': med.price * qty})
-            total_amount += med.price * qty
 
-    return render_template('checkout.html', cart_items=cart_items, total_amount=total_amount)
+    return render_template('checkout.html', cart_items=cart_view.items, total_amount=cart_view.total_amount)
 
 @app.route('/place_order', methods=['POST'])
 @login_required
 def place_order():
-    cart_session = session.get('cart', {})
-    if not cart_session:
+    # Only lines whose medicine still exists count; an empty result would create no orders
+    cart_lines = hydrate_cart(cart_quantities(current_user.id)).items
+    if not cart_lines:
+        flash('Cart is empty', 'warning')
         return redirect(url_for('index'))
 
     # Validate Address Fields
@@ -513,23 +879,34 @@ def place_order():
         flash('Please provide a complete delivery address.', 'error')
         return redirect(url_for('checkout'))
 
+    # Take the stock first: one conditional UPDATE, checked by the database
+    reserved = reserve_stock({line.medicine.id: line.quantity for line in cart_lines})
+    failed = [line for line in cart_lines if line.medicine.id not in reserved]
+    if failed:
+        names = ', '.join(line.medicine.name for line in failed)
+        db.session.rollback()
+        flash(f'Not enough stock for: {names}. Please update your cart and try again.', 'error')
+        return redirect(url_for('cart'))
+
+    # Catalog cards only change when stock drops into the "Only N left!" range or sells out
+    if db.session.scalar(select(func.count()).select_from(Medicine)
+                         .where(Medicine.id.in_(reserved), Medicine.quantity <= LOW_STOCK_LEVEL)):
+        catalog_version.bump()
+
     # Group items by Store Manager
     manager_orders = {} # store_manager_id -> {items: [], total: 0}
     
-    for med_id, qty in cart_session.items():
-        med = Medicine.query.get(int(med_id))
-        if med:
-            mgr_id = med.user_id # The store manager who owns this medicine
-            if mgr_id not in manager_orders:
-                manager_orders[mgr_id] = {'items': [], 'total': 0}
-            
-            manager_orders[mgr_id]['total'] += med.price * qty
-            if med.quantity >= qty:
-                med.quantity -= qty
-            
-            manager_orders[mgr_id]['items'].append({
-                'med_id': med.id, 'name': med.name, 'qty': qty, 'price': med.price
-            })
+    for line in cart_lines:
+        med, qty = line.medicine, line.quantity
+        mgr_id = med.user_id # The store manager who owns this medicine
+        if mgr_id not in manager_orders:
+            manager_orders[mgr_id] = {'items': [], 'total': 0}
+
+        manager_orders[mgr_id]['total'] += line.total
+
+        manager_orders[mgr_id]['items'].append({
+            'med_id': med.id, 'name': med.name, 'qty': qty, 'price': med.price, 'category_id': med.category_id
+        })
 
     payment_method = request.form.get('payment_method')
     created_orders = []
@@ -546,7 +923,9 @@ def place_order():
             area_landmark=area_landmark,
             city=city,
             state=state,
-            pincode=pincode
+            pincode=pincode,
+            item_count=len(data['items']),
+            items_summary=summarize_order_items((item['name'], item['qty']) for item in data['items'])
         )
         db.session.add(new_order)
         db.session.flush() # Populate ID
@@ -560,11 +939,15 @@ def place_order():
                 price=item['price']
             )
             db.session.add(order_item)
+
+        # Sales rollups move in the same transaction as the order
+        record_order_sales(new_order, [(item['med_id'], item['name'], item['category_id'], item['qty'], item['price'])
+                                       for item in data['items']])
         
         created_orders.append(new_order)
 
+    clear_cart(current_user.id) # Same transaction as the orders
     db.session.commit()
-    session.pop('cart', None)
     
     return render_template('order_confirmation.html', orders=created_orders)
 
@@ -657,28 +1040,51 @@ HEALTH_KB = {
             'stroke', 'blood clot', 'poor blood circulation', 'circulation'
         ],
         'message': "We could not find a safe over-the-counter medicine for this condition. Please consult a qualified doctor for accurate diagnosis and treatment.",
-        'supportive_label': " (Supportive Care Only – Not a treatment for heart conditions)"
+        'supportive_label': " (Supportive Care Only – Not a treatment for heart conditions)",
+        # Conditional supportive meds inside heart safe mode
+        'acidity_keywords': ['burning', 'acidity'],
+        'ors_keywords': ['weakness', 'dehydration', 'low blood pressure', 'hypotension', 'low bp'],
+        # If none of these match we may still offer low-dose paracetamol
+        'severe_keywords': ['attack', 'severe', 'crushing', 'stroke', 'clot', 'hypertension', 'high bp', 'high blood pressure', 'cholesterol', 'clot', 'angina']
     }
 }
 
+def build_symptom_matcher(kb):
+    """Compiles every HEALTH_KB keyword list into one automaton (built once at import)."""
+    heart = kb['heart_safe_mode']
+    groups = {
+        'heart': heart['keywords'],
+        'heart_acidity': heart['acidity_keywords'],
+        'heart_ors': heart['ors_keywords'],
+        'heart_severe': heart['severe_keywords'],
+        'level_2': kb['level_2_chronic_sensitive']['keywords'],
+    }
+    for idx, data in enumerate(kb['level_1_acute']):
+        groups[('level_1', idx)] = data['keywords']
+    return KeywordMatcher(groups)
+
+SYMPTOM_MATCHER = build_symptom_matcher(HEALTH_KB)
+
 def smart_symptom_match(query):
     query = query.lower().strip()
     results = []
+
+    # Every keyword hit across the whole KB, found in a single pass
+    hits = SYMPTOM_MATCHER.match(query)
     
     # 0. HEART & CHEST SAFE MODE (Priority)
-    if any(k in query for k in HEALTH_KB['heart_safe_mode']['keywords']):
+    if 'heart' in hits:
         heart_meds = []
         label = HEALTH_KB['heart_safe_mode']['supportive_label']
         
         # Conditional Supportive Meds
-        if 'burning' in query or 'acidity' in query:
+        if 'heart_acidity' in hits:
             heart_meds.extend(["Digene Syrup" + label, "Gelusil" + label])
-        if any(k in query for k in ['weakness', 'dehydration', 'low blood pressure', 'hypotension', 'low bp']):
+        if 'heart_ors' in hits:
             heart_meds.append("ORS" + label)
         
         # If not indicate severe risk (heart attack, stroke, etc.)
-        severe_keywords = ['attack', 'severe', 'crushing', 'stroke', 'clot', 'hypertension', 'high bp', 'high blood pressure', 'cholesterol', 'clot', 'angina']
-        if not any(k in query for k in severe_keywords):
+        if 'heart_severe' not in hits:
              heart_meds.append("Paracetamol (LOW DOSE)" + label)
              
         results.append({
@@ -690,8 +1096,8 @@ def smart_symptom_match(query):
         return results # Exit early with specialized heart warning
 
     # 1. LEVEL 1: Check for Acute Symptoms
-    for data in HEALTH_KB['level_1_acute']:
-        if any(k in query for k in data['keywords']):
+    for idx, data in enumerate(HEALTH_KB['level_1_acute']):
+        if ('level_1', idx) in hits:
             results.append({
                 'disease': "Recommended Care",
                 'category': data['category'],
@@ -701,7 +1107,7 @@ def smart_symptom_match(query):
 
     # 2. LEVEL 2: Check for Chronic / Sensitive / Lifestyle
     # If Level 2 matches, we provide supportive care (even if it matches Level 1)
-    if any(k in query for k in HEALTH_KB['level_2_chronic_sensitive']['keywords']):
+    if 'level_2' in hits:
         # If we already have results (maybe from a Level 1 match), we add Level 2 context
         # But per requirements, Level 2 message is specific
         results.append({
@@ -752,27 +1158,34 @@ def support():
     return render_template('support.html')
 
 @app.route('/healthcare')
+@conditional_catalog_page
 def healthcare():
     search_query = request.args.get('search', '').lower()
     category_filter = request.args.get('category', 'Must Haves')
     
-    query = Medicine.query.join(Category).filter(Category.name == category_filter)
-    
-    if search_query:
-        query = query.filter(
-            db.or_(
-                Medicine.name.ilike(f'%{search_query}%'),
-                Medicine.composition.ilike(f'%{search_query}%')
-            )
-        )
+    query = (Medicine.query.join(Category).filter(Category.name == category_filter)
+             .options(contains_eager(Medicine.category)))
         
     if current_user.is_authenticated and current_user.role == 'store_manager':
         query = query.filter(Medicine.user_id == current_user.id)
+    else:
+        query = query.filter(Medicine.availability == True) # Expired stock is flagged by the sweeper
+
+    if request.args.get('hide_expired'):
+        query = hide_expired(query)
+
+    cursor = request.args.get('cursor')
+    page_size = page_size_arg(request.args.get('per_page'))
+    if search_query:
+        page = paginate_ranked(apply_search(query, search_query), cursor, page_size)
+    else:
+        page = paginate_keyset(query, [Medicine.name, Medicine.id], cursor, page_size)
         
     return render_template('healthcare.html', 
-                         medicines=query.all(), 
+                         medicines=page.items, 
                          current_category=category_filter,
-                         categories=[c.name for c in Category.query.all()])
+                         categories=[c.name for c in category_cache.get()],
+                         pager=pager_urls(page))
 
 
 @app.route('/add_category', methods=['POST'])
@@ -782,6 +1195,8 @@ def add_category():
     if name:
         if not Category.query.filter_by(name=name).first():
             db.session.add(Category(name=name))
+            category_cache.invalidate()
+            catalog_version.bump()
             db.session.commit()
             flash('Category added', 'success')
     return redirect(url_for('dashboard'))
@@ -799,7 +1214,7 @@ def prescription_upload():
 
 
 def inject_categories():
-    HEALTH_CATEGORIES = [c.name for c in Category.query.all()]
+    HEALTH_CATEGORIES = [c.name for c in category_cache.get()]
     MEDICINE_TYPES_NAV = [
         "Tablet", "Capsule", "Syrup", "Cream", 
         "Ointment", "Drops", "Injection", "Powder",
@@ -812,4 +1227,6 @@ def inject_categories():
     return dict(health_categories=HEALTH_CATEGORIES, medicine_types=MEDICINE_TYPES_NAV)
 
 if __name__ == '__main__':
+    with app.app_context():
+        init_db()
     app.run(debug=True)
@@ -1,6 +1,8 @@
-from app import app, db, User, Medicine
+import sys
+from app import app, User
+from maintenance import reassign_medicines
 
-def assign_medicines_to_virat():
+def assign_medicines_to_virat(dry_run=False):
     with app.app_context():
         # Find default manager 'virat'
         virat = User.query.filter_by(username='virat').first()
@@ -14,28 +16,13 @@ def assign_medicines_to_virat():
              print("Error: Could not find or create user 'virat'.")
              return
 
-        print(f"Assigning ALL existing medicines to virat (ID: {virat.id})...")
-        
-        # Check count before
-        total_meds = Medicine.query.count()
-        virat_meds = Medicine.query.filter_by(user_id=virat.id).count()
-        print(f"Total Medicines: {total_meds}")
-        print(f"Virat's Medicines (Before): {virat_meds}")
+        print(f"Assigning ALL existing medicines to virat (ID: {virat.id})..." + (" (dry run)" if dry_run else ""))
 
-        # Update all medicines where user_id is NOT virat.id or is NULL
-        # Start transaction to update
+        # Medicines owned by anyone else, or by no one, in chunked UPDATEs
         try:
-             # Find meds not owned by virat
-             meds_to_update = Medicine.query.filter(Medicine.user_id != virat.id).all()
-             for med in meds_to_update:
-                 med.user_id = virat.id
-             
-             db.session.commit()
-             print(f"Updated {len(meds_to_update)} medicines to belong to virat.")
-             
+            reassign_medicines(virat.id, dry_run=dry_run)
         except Exception as e:
             print(f"Error during migration: {e}")
-            db.session.rollback()
 
 if __name__ == "__main__":
-    assign_medicines_to_virat()
+    assign_medicines_to_virat(dry_run='--dry-run' in sys.argv)
@@ -0,0 +1,67 @@
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from app import app, db, User, Medicine, Category
+from inventory_import import import_medicines, IMPORT_FIELDS
+from werkzeug.security import generate_password_hash
+
+# Run against any database: DATABASE_URL=postgresql://... python bench_import.py 50000
+
+def write_csv(path, rows, categories):
+    expiry = (date.today() + timedelta(days=365)).isoformat()
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(IMPORT_FIELDS)
+        for i in range(rows):
+            writer.writerow([f'Bench SKU {i:07d}', categories[i % len(categories)], 10 + i % 90, 1 + i % 200,
+                             expiry, 'Tablet', 'Strip', '', 'Benchmark compound 500 mg'])
+
+def per_row_baseline(user_id, rows, category_id):
+    """What onboarding costs today: one add_medicine-style commit per row."""
+    start = time.perf_counter()
+    for i in range(rows):
+        db.session.add(Medicine(name=f'Baseline SKU {i:07d}', price=10, quantity=1, category_id=category_id,
+                                expiry_date=date.today() + timedelta(days=365), user_id=user_id))
+        db.session.commit()
+    return rows / (time.perf_counter() - start)
+
+def bench_import(sizes):
+    with app.app_context():
+        print(f"--- Bulk Import Benchmark ({db.engine.dialect.name}) ---")
+        user = User.query.filter_by(username='bench_importer').first()
+        if not user:
+            user = User(username='bench_importer', password_hash=generate_password_hash('pass'), role='store_manager')
+            db.session.add(user)
+            db.session.commit()
+        user_id = user.id
+        categories = [c.name for c in Category.query.all()]
+
+        try:
+            baseline = per_row_baseline(user_id, 500, Category.query.first().id)
+            print(f"{'Per-row commit (500 rows)':<28} | {baseline:>10.0f} rows/s |")
+            print("-" * 66)
+            print(f"{'Streaming import':<28} | {'rows/s':>10} {'':<6} | {'peak MB':>8} | {'updates':>8}")
+
+            with tempfile.TemporaryDirectory() as tmp:
+                for rows in sizes:
+                    path = os.path.join(tmp, f'stock_{rows}.csv')
+                    write_csv(path, rows, categories)
+                    for label in ['insert', 'upsert']: # Second pass hits the update path
+                        tracemalloc.start()
+                        with open(path, newline='') as stream:
+                            result = import_medicines(stream, 'csv', user_id)
+                        peak = tracemalloc.get_traced_memory()[1] / 1e6
+                        tracemalloc.stop()
+                        print(f"{f'{rows} rows ({label})':<28} | {rows / result.seconds:>10.0f} {'':<6} | "
+                              f"{peak:>8.1f} | {result.updated:>8}")
+        finally:
+            Medicine.query.filter_by(user_id=user_id).delete()
+            db.session.delete(db.session.get(User, user_id))
+            db.session.commit()
+
+if __name__ == "__main__":
+    bench_import([int(n) for n in sys.argv[1:]] or [5000, 50000])
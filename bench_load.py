@@ -0,0 +1,334 @@
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+
+# --- Storefront Load Benchmark ---
+# Builds a synthetic catalog + order history in a throwaway SQLite file, then drives the
+# search, healthcare, cart, checkout and dashboard paths through app.test_client() and,
+# with --gunicorn, through a real gunicorn server. Reports req/s, p50/p99 latency and
+# SQL queries per request so regressions show up as numbers.
+#
+#   python bench_load.py --medicines 100000 --managers 20 --requests 300 --gunicorn
+
+PASSWORD = 'bench-pass'
+BRANDS = ['Dolo', 'Crocin', 'Calpol', 'Combiflam', 'Allegra', 'Cetzine', 'Montair', 'Pantocid', 'Glycomet',
+          'Telma', 'Atorva', 'Ecosprin', 'Limcee', 'Shelcal', 'Neurobion', 'Zincovit', 'Digene', 'Benadryl']
+MOLECULES = ['Paracetamol', 'Ibuprofen', 'Cetirizine', 'Montelukast', 'Pantoprazole', 'Metformin',
+             'Telmisartan', 'Atorvastatin', 'Aspirin', 'Vitamin C', 'Calcium', 'Vitamin B12', 'Zinc']
+FORMS = [('Tablet', 'Strip'), ('Syrup', 'Bottle'), ('Capsule', 'Strip'), ('Cream', 'Tube'), ('Drops', 'Bottle')]
+SEARCH_TERMS = ['dolo', 'paracetamol 500', 'vitamin', 'crocin adv', 'metformin', 'zinc', 'syrup', 'cal']
+ADDRESS = {'payment_method': 'COD', 'full_name': 'Load Tester', 'mobile_number': '9999999999',
+           'address_line1': '1 Bench Street', 'area_landmark': 'Near Lab', 'city': 'Pune', 'state': 'MH',
+           'pincode': '411001'}
+
+
+# --- Dataset ---
+
+def generate_dataset(medicines, managers, customers, orders, seed=42):
+    from app import app, db, init_db
+    from models import User, Medicine, Category, Order, OrderItem, StarterSeed, summarize_order_items
+    from analytics import backfill_sales_rollups
+    from expiry_sweeper import sweep_expiry
+    from sqlalchemy import insert, select, func
+    from werkzeug.security import generate_password_hash
+    from datetime import date, datetime, timedelta
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    with app.app_context():
+        init_db()
+        password_hash = generate_password_hash(PASSWORD) # Hash once, share across synthetic users
+        db.session.execute(insert(User), [{'username': f'bench_mgr_{i}', 'password_hash': password_hash,
+                                           'role': 'store_manager'} for i in range(managers)])
+        db.session.execute(insert(User), [{'username': f'bench_cust_{i}', 'password_hash': password_hash,
+                                           'role': 'customer'} for i in range(customers)])
+        manager_ids = list(db.session.execute(select(User.id).where(User.username.like('bench_mgr_%'))).scalars())
+        db.session.execute(insert(StarterSeed), [{'user_id': m} for m in manager_ids]) # Skip starter seeding
+        db.session.commit()
+
+        category_ids = list(db.session.execute(select(Category.id)).scalars())
+        today = date.today()
+        table = Medicine.__table__
+        for start in range(0, medicines, 5000):
+            rows = []
+            for i in range(start, min(start + 5000, medicines)):
+                form, unit = rng.choice(FORMS)
+                molecule = rng.choice(MOLECULES)
+                rows.append({
+                    'name': f'{rng.choice(BRANDS)} {molecule} {rng.choice([50, 100, 250, 500, 650])}mg #{i}',
+                    'price': round(rng.uniform(10, 900), 2), 'quantity': 1_000_000,
+                    'expiry_date': today + timedelta(days=rng.randint(-30, 720)), 'availability': True,
+                    'category_id': rng.choice(category_ids), 'user_id': manager_ids[i % len(manager_ids)],
+                    'medicine_type': form, 'unit': unit, 'composition': f'{molecule} IP {rng.randint(5, 650)} mg'
+                })
+            db.session.execute(insert(table), rows)
+            db.session.commit()
+
+        # Order history: a few items per order, all from the order's store
+        customer_ids = list(db.session.execute(select(User.id).where(User.username.like('bench_cust_%'))).scalars())
+        med_rows = db.session.execute(select(Medicine.id, Medicine.name, Medicine.price, Medicine.user_id)
+                                      .where(Medicine.user_id.in_(manager_ids))
+                                      .order_by(func.random()).limit(5000)).all()
+        by_store = {}
+        for row in med_rows:
+            by_store.setdefault(row.user_id, []).append(row)
+        for start in range(0, orders, 2000):
+            batch = []
+            for _ in range(min(2000, orders - start)):
+                store = rng.choice(list(by_store))
+                items = [(med, rng.randint(1, 3)) for med in rng.sample(by_store[store], min(3, len(by_store[store])))]
+                batch.append((store, items))
+            first_id = (db.session.execute(select(func.max(Order.id))).scalar() or 0) + 1
+            db.session.execute(insert(Order), [{
+                'user_id': rng.choice(customer_ids), 'store_manager_id': store, 'payment_method': 'COD',
+                'order_date': datetime.utcnow() - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 1440)),
+                'total_amount': round(sum(med.price * qty for med, qty in items), 2),
+                'status': rng.choice(['Placed', 'Packed', 'Delivered', 'Delivered', 'Cancelled']),
+                'item_count': len(items), 'items_summary': summarize_order_items((med.name, qty) for med, qty in items),
+                **{k: v for k, v in ADDRESS.items() if k != 'payment_method'}
+            } for store, items in batch])
+            db.session.execute(insert(OrderItem), [
+                {'order_id': first_id + n, 'medicine_id': med.id, 'medicine_name': med.name, 'quantity': qty,
+                 'price': med.price}
+                for n, (store, items) in enumerate(batch) for med, qty in items])
+            db.session.commit()
+
+        sweep_expiry()
+        backfill_sales_rollups()
+    print(f"Generated {medicines} medicines, {managers} managers, {customers} customers, {orders} orders "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+# --- Drivers ---
+
+class TestClientDriver:
+    """In-process requests; queries are counted with an engine event (one request at a time)."""
+
+    def __init__(self):
+        from app import app, db
+        from sqlalchemy import event
+        self.app = app
+        self.queries = 0
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self.count)
+
+    def count(self, *args):
+        self.queries += 1
+
+    def session(self, username):
+        from models import User
+        client = self.app.test_client()
+        with self.app.app_context():
+            user_id = User.query.filter_by(username=username).first().id
+        with client.session_transaction() as sess:
+            sess['_user_id'] = str(user_id)
+            sess['_fresh'] = True
+        return self.Session(self, client)
+
+    class Session:
+        def __init__(self, driver, client):
+            self.driver, self.client = driver, client
+
+        def request(self, method, path, data=None):
+            before = self.driver.queries
+            start = time.perf_counter()
+            response = self.client.open(path, method=method, data=data)
+            elapsed = time.perf_counter() - start
+            return response.status_code, elapsed, self.driver.queries - before
+
+
+class HttpDriver:
+    """A real gunicorn server; queries per request come from the X-DB-Queries header (PERF_MONITOR=1)."""
+
+    def __init__(self, db_url, workers):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            self.port = sock.getsockname()[1]
+        env = dict(os.environ, DATABASE_URL=db_url, PERF_MONITOR='1', PERF_SLOW_MS='100000')
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', 'app:app', '-w', str(workers), '-b', f'127.0.0.1:{self.port}',
+             '--log-level', 'warning'],
+            env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{self.port}/about', timeout=1)
+                return
+            except OSError:
+                time.sleep(0.2)
+        self.close()
+        raise SystemExit("gunicorn did not start")
+
+    def close(self):
+        self.process.terminate()
+        self.process.wait(timeout=10)
+
+    def session(self, username):
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+        session = self.Session(self, opener)
+        session.request('POST', '/login', {'username': username, 'password': PASSWORD})
+        return session
+
+    class Session:
+        def __init__(self, driver, opener):
+            self.driver, self.opener = driver, opener
+
+        def request(self, method, path, data=None):
+            body = urllib.parse.urlencode(data).encode() if data is not None else None
+            req = urllib.request.Request(f'http://127.0.0.1:{self.driver.port}{path}', data=body, method=method)
+            start = time.perf_counter()
+            try:
+                with self.opener.open(req, timeout=30) as response:
+                    response.read()
+                    status, queries = response.status, int(response.headers.get('X-DB-Queries', 0))
+            except urllib.error.HTTPError as e:
+                status, queries = e.code, 0
+            return status, time.perf_counter() - start, queries
+
+
+# --- Scenarios (each call is one user action, possibly several requests) ---
+
+def scenario_search(session, rng, ctx):
+    return [session.request('GET', f"/medicines?search={urllib.parse.quote(rng.choice(SEARCH_TERMS))}")]
+
+def scenario_healthcare(session, rng, ctx):
+    return [session.request('GET', f"/healthcare?category={urllib.parse.quote(rng.choice(ctx['categories']))}")]
+
+def scenario_cart(session, rng, ctx):
+    med_id = rng.choice(ctx['medicine_ids'])
+    return [session.request('POST', f"/add_to_cart/{med_id}", {'quantity': 1}),
+            session.request('GET', '/cart'),
+            session.request('GET', f"/remove_from_cart/{med_id}")] # Keep the cart size steady
+
+def scenario_checkout(session, rng, ctx):
+    return [session.request('POST', f"/add_to_cart/{rng.choice(ctx['medicine_ids'])}", {'quantity': 1}),
+            session.request('POST', '/place_order', ADDRESS)]
+
+def scenario_dashboard(session, rng, ctx):
+    return [session.request('GET', '/dashboard')]
+
+SCENARIOS = {
+    'search': (scenario_search, 'customer'),
+    'healthcare': (scenario_healthcare, 'customer'),
+    'cart': (scenario_cart, 'customer'),
+    'checkout': (scenario_checkout, 'customer'),
+    'dashboard': (scenario_dashboard, 'manager'),
+}
+
+
+def run_scenario(driver, name, iterations, concurrency, ctx):
+    action, role = SCENARIOS[name]
+    prefix = 'bench_mgr_' if role == 'manager' else 'bench_cust_'
+    pool = ctx['managers'] if role == 'manager' else ctx['customers']
+    samples = []
+    lock = threading.Lock()
+
+    def worker(n):
+        rng = random.Random(n)
+        session = driver.session(f'{prefix}{n % pool}')
+        for _ in range(iterations // concurrency):
+            results = action(session, rng, ctx)
+            with lock:
+                samples.extend(results)
+
+    start = time.perf_counter()
+    if concurrency == 1:
+        worker(0)
+    else:
+        with ThreadPoolExecutor(concurrency) as executor:
+            list(executor.map(worker, range(concurrency)))
+    wall = time.perf_counter() - start
+    return summarize(name, samples, wall)
+
+
+def summarize(name, samples, wall):
+    from perf_monitor import percentile
+    latencies = sorted(s[1] * 1000 for s in samples)
+    return {
+        'scenario': name, 'requests': len(samples), 'req_per_s': round(len(samples) / wall, 1),
+        'p50_ms': round(percentile(latencies, 50), 2), 'p99_ms': round(percentile(latencies, 99), 2),
+        'queries_per_req': round(sum(s[2] for s in samples) / max(1, len(samples)), 1),
+        'errors': sum(1 for s in samples if s[0] >= 400)
+    }
+
+
+def print_results(title, results):
+    print(f"\n--- {title} ---")
+    print(f"{'Scenario':<12} | {'reqs':>6} | {'req/s':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'queries':>7} | {'errors':>6}")
+    print("-" * 74)
+    for r in results:
+        print(f"{r['scenario']:<12} | {r['requests']:>6} | {r['req_per_s']:>8} | {r['p50_ms']:>8} | "
+              f"{r['p99_ms']:>8} | {r['queries_per_req']:>7} | {r['errors']:>6}")
+
+
+def bench_load(args):
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='medstore-bench-'), 'bench.db')
+    db_url = f'sqlite:///{os.path.abspath(db_path)}'
+    os.environ['DATABASE_URL'] = db_url # Must be set before app is imported
+    if not args.reuse and os.path.exists(db_path):
+        os.remove(db_path)
+    if not args.reuse:
+        generate_dataset(args.medicines, args.managers, args.customers, args.orders)
+
+    from app import app, db
+    from models import Medicine, Category
+    with app.app_context():
+        ctx = {
+            'categories': [name for (name,) in db.session.query(Category.name)],
+            'medicine_ids': [mid for (mid,) in db.session.query(Medicine.id).filter(Medicine.availability == True)
+                             .order_by(db.func.random()).limit(2000)],
+            'managers': args.managers, 'customers': args.customers
+        }
+
+    scenarios = args.scenarios.split(',')
+    report = {'database': db_url, 'dataset': vars(args), 'results': {}}
+
+    driver = TestClientDriver()
+    results = [run_scenario(driver, name, args.requests, 1, ctx) for name in scenarios]
+    print_results("app.test_client() (single thread)", results)
+    report['results']['test_client'] = results
+
+    if args.gunicorn:
+        driver = HttpDriver(db_url, args.workers)
+        try:
+            results = [run_scenario(driver, name, args.requests, args.concurrency, ctx) for name in scenarios]
+        finally:
+            driver.close()
+        print_results(f"gunicorn ({args.workers} workers, {args.concurrency} concurrent clients)", results)
+        report['results']['gunicorn'] = results
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    if args.db:
+        print(f"Database kept at {db_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Storefront load benchmark on a synthetic SQLite dataset.')
+    parser.add_argument('--medicines', type=int, default=10000)
+    parser.add_argument('--managers', type=int, default=5)
+    parser.add_argument('--customers', type=int, default=50)
+    parser.add_argument('--orders', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=200, help='Actions per scenario')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--gunicorn', action='store_true', help='Also benchmark a real gunicorn server')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--db', help='SQLite file to use (default: a temp file)')
+    parser.add_argument('--reuse', action='store_true', help='Reuse --db as generated by an earlier run')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    bench_load(parser.parse_args())
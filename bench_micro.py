@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import timeit
+from datetime import date, datetime, timedelta
+
+# --- Hot-Path Micro-Benchmarks ---
+# Times the per-request CPU work that no SQL counter sees: the symptom matcher, the
+# formulation parser and Jinja rendering of the 1k-card catalog and dashboard pages.
+# Results are compared against bench_baselines.json so a slower commit fails loudly.
+# Baselines are machine-specific: re-record them with --save on the box that runs the check.
+#
+#   python bench_micro.py                  # run and compare against the stored baselines
+#   python bench_micro.py --save           # record new baselines (after an intended change)
+#   python bench_micro.py --threshold 0.4  # allow 40% before flagging (noisy CI boxes)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baselines.json')
+DEFAULT_THRESHOLD = 0.25 # Flag anything more than 25% slower than its baseline
+CARDS = 1000
+
+FILLER = ['since', 'yesterday', 'my', 'son', 'has', 'been', 'feeling', 'very', 'tired', 'and', 'also', 'a',
+          'little', 'after', 'lunch', 'with', 'some', 'mild', 'at', 'night', 'please', 'suggest', 'something']
+SYMPTOMS = ['fever', 'headache', 'cough', 'cold', 'body pain', 'acidity', 'loose motion', 'sore throat']
+COMPOSITION = """Active Ingredient: Paracetamol {strength} mg
+Caffeine 25 mg
+Excipients: Microcrystalline cellulose, Maize starch
+Povidone, Magnesium stearate, Purified talc
+Dosage Form: Film-coated tablet
+Uses: Relief of fever and mild to moderate pain
+Headache, toothache and body ache"""
+
+
+def symptom_text(rng, words, symptoms):
+    """A long free-text query like users paste into the symptom checker."""
+    tokens = [rng.choice(FILLER) for _ in range(words)]
+    for symptom in symptoms:
+        tokens.insert(rng.randrange(len(tokens)), symptom)
+    return ' '.join(tokens)
+
+
+def fake_catalog(count, seed=7):
+    """Transient Medicine/Order rows shaped like a full page, so rendering needs no queries."""
+    from models import Medicine, Category, Order, NearExpiryItem
+    rng = random.Random(seed)
+    today = date.today()
+    categories = [Category(id=i, name=name) for i, name in
+                  enumerate(['Pain Relief', 'Cold & Cough', 'Digestive Care', 'Vitamins', 'Diabetes'], 1)]
+    medicines = []
+    for i in range(1, count + 1):
+        category = categories[i % len(categories)]
+        medicines.append(Medicine(
+            id=i, name=f'Bench Medicine {i:05d} 500mg', price=round(rng.uniform(5, 500), 2),
+            quantity=rng.choice([0, 3, 25, 120]), availability=True,
+            expiry_date=today + timedelta(days=rng.choice([-10, 20, 400])),
+            category_id=category.id, category=category, medicine_type='Tablet', unit='Strip',
+            image_url=None, composition=COMPOSITION.format(strength=100 + i % 50 * 10)))
+    orders = [Order(id=i, full_name=f'Customer {i}', mobile_number='9999999999', payment_method='COD',
+                    address_line1='1 Bench Street', area_landmark='Near Lab', city='Pune', state='MH',
+                    pincode='411001', total_amount=round(rng.uniform(50, 2000), 2), status='Placed',
+                    order_date=datetime(2026, 1, 1) + timedelta(hours=i), item_count=3,
+                    items_summary='Bench Medicine 00001 x2, Bench Medicine 00002 x1, ...')
+              for i in range(1, count + 1)]
+    worklist = [NearExpiryItem(medicine_id=m.id, medicine_name=m.name, expiry_date=m.expiry_date,
+                               quantity=m.quantity, status='Near Expiry', refreshed_at=datetime(2026, 1, 1))
+                for m in medicines[:20]]
+    return categories, medicines, orders, worklist
+
+
+# --- Benchmarks ---
+# Each entry builds its inputs once and returns the zero-argument callable to time.
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark('symptom_match_short')
+def bench_symptom_short(app):
+    from app import smart_symptom_match
+    return lambda: smart_symptom_match('fever and headache since morning')
+
+
+@benchmark('symptom_match_long')
+def bench_symptom_long(app):
+    from app import smart_symptom_match
+    text = symptom_text(random.Random(1), 400, SYMPTOMS)
+    return lambda: smart_symptom_match(text)
+
+
+@benchmark('symptom_match_no_hit')
+def bench_symptom_no_hit(app):
+    from app import smart_symptom_match
+    text = symptom_text(random.Random(2), 400, [])
+    return lambda: smart_symptom_match(text)
+
+
+@benchmark('parse_formulation')
+def bench_parse_formulation(app):
+    from app import parse_formulation
+    text = COMPOSITION.format(strength=500)
+    parse = parse_formulation.__wrapped__ # Time the parser itself, not the lru_cache lookup
+    return lambda: parse(text)
+
+
+def bench_render(template, **context):
+    from flask import render_template
+    app = context.pop('app')
+
+    def run():
+        with app.test_request_context('/'):
+            return render_template(template, **context)
+    run() # Warm the template cache, category cache and parse_formulation cache
+    return run
+
+
+@benchmark('render_medicines_1k')
+def bench_render_medicines(app):
+    categories, medicines, orders, worklist = fake_catalog(CARDS)
+    return bench_render('medicines.html', app=app, medicines=medicines, current_category='All Medicines',
+                        pager={'next_url': '/medicines?cursor=x', 'first_url': None})
+
+
+@benchmark('render_healthcare_1k')
+def bench_render_healthcare(app):
+    categories, medicines, orders, worklist = fake_catalog(CARDS)
+    return bench_render('healthcare.html', app=app, medicines=medicines, current_category='Healthcare',
+                        categories=categories, pager={'next_url': '/healthcare?cursor=x', 'first_url': None})
+
+
+@benchmark('render_dashboard_1k')
+def bench_render_dashboard(app):
+    from inventory_import import IMPORT_FIELDS
+    categories, medicines, orders, worklist = fake_catalog(CARDS)
+    stats = {'total': CARDS, 'available': CARDS, 'out_of_stock': 0, 'total_orders': CARDS, 'pending_orders': 10,
+             'delivered_orders': 5, 'near_expiry': 20, 'expired': 3, 'categories': len(categories)}
+    pager = {'next_url': '/dashboard?cursor=x', 'first_url': None}
+    return bench_render('dashboard.html', app=app, medicines=medicines, expiry_worklist=worklist,
+                        import_fields=IMPORT_FIELDS, categories=categories, orders=orders,
+                        medicine_pager=pager, order_pager=pager, stats=stats)
+
+
+# --- Runner ---
+
+def measure(fn, repeats, min_time=0.2):
+    """Best-of-`repeats` seconds per call; each repeat runs for at least `min_time` seconds."""
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeats, number=number)) / number
+
+
+def format_time(seconds):
+    if seconds >= 1e-3:
+        return f'{seconds * 1e3:.2f} ms'
+    return f'{seconds * 1e6:.1f} us'
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get('benchmarks', {})
+
+
+def save_baselines(path, results):
+    data = {
+        'python': platform.python_version(),
+        'machine': f'{platform.system()} {platform.machine()}',
+        'recorded': date.today().isoformat(),
+        'benchmarks': {name: round(seconds, 9) for name, seconds in results.items()}
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def run(names, repeats, baselines, threshold):
+    from app import app, init_db
+    with app.app_context():
+        init_db() # Categories for the nav context processor
+
+    print(f"--- Micro-Benchmarks (best of {repeats}, regression threshold {threshold:.0%}) ---")
+    print(f"{'Benchmark':<24} | {'per call':>10} | {'baseline':>10} | {'change':>8}")
+    print("-" * 62)
+
+    results, regressions = {}, []
+    for name in names:
+        with app.app_context():
+            seconds = measure(BENCHMARKS[name](app), repeats)
+        results[name] = seconds
+        baseline = baselines.get(name)
+        if baseline:
+            change = seconds / baseline - 1
+            flag = ' REGRESSION' if change > threshold else ''
+            if flag:
+                regressions.append(name)
+            print(f"{name:<24} | {format_time(seconds):>10} | {format_time(baseline):>10} | {change:>+7.0%}{flag}")
+        else:
+            print(f"{name:<24} | {format_time(seconds):>10} | {'-':>10} | {'new':>8}")
+    return results, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks for the symptom matcher, formulation parser and page rendering.')
+    parser.add_argument('--save', action='store_true', help=f'Write the results to {os.path.basename(BASELINE_FILE)}')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Allowed slowdown, 0.25 = 25%%')
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--only', help='Comma-separated benchmark names')
+    parser.add_argument('--baselines', default=BASELINE_FILE)
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}; choose from {', '.join(BENCHMARKS)}")
+
+    # Rendering needs the category table only; keep it away from the real database
+    if 'DATABASE_URL' not in os.environ:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='bench_micro_'), 'bench.db')
+
+    baselines = load_baselines(args.baselines)
+    results, regressions = run(names, args.repeats, {} if args.save else baselines, args.threshold)
+
+    if args.save:
+        save_baselines(args.baselines, dict(baselines, **results))
+        print(f"\nSaved {len(results)} baseline(s) to {args.baselines}")
+    elif regressions:
+        print(f"\nFAIL: {len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}: "
+              f"{', '.join(regressions)}")
+        sys.exit(1)
+    else:
+        print("\nPASS: no regressions")
+
+
+if __name__ == "__main__":
+    main()
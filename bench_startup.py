@@ -0,0 +1,47 @@
+import os
+import statistics
+import subprocess
+import sys
+
+# Runs in a fresh interpreter so every measurement is a real cold import
+PROBE = """
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+queries = []
+event.listen(Engine, 'before_cursor_execute', lambda *args: queries.append(1))
+start = time.perf_counter()
+import app
+print(time.perf_counter() - start, len(queries))
+"""
+
+def measure(env_overrides, runs):
+    env = dict(os.environ, **env_overrides)
+    times, queries = [], 0
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', PROBE], env=env, capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        if out.returncode != 0:
+            raise SystemExit(out.stderr)
+        elapsed, count = out.stdout.strip().splitlines()[-1].split()
+        times.append(float(elapsed))
+        queries = int(count)
+    return times, queries
+
+def bench_startup(runs=10):
+    print(f"--- Cold Start Benchmark ({runs} runs each) ---")
+    print(f"{'Mode':<32} | {'median ms':>9} | {'min ms':>7} | {'queries':>7}")
+    print("-" * 65)
+
+    results = {}
+    for label, env in [("Init at import (AUTO_INIT_DB=1)", {'AUTO_INIT_DB': '1'}),
+                       ("Fast start (default)", {'AUTO_INIT_DB': '0'})]:
+        times, queries = measure(env, runs)
+        results[label] = statistics.median(times)
+        print(f"{label:<32} | {statistics.median(times) * 1000:>9.1f} | {min(times) * 1000:>7.1f} | {queries:>7}")
+
+    before, after = results.values()
+    print(f"\nSpeedup: {before / after:.1f}x faster cold import")
+
+if __name__ == "__main__":
+    bench_startup(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
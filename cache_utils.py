@@ -0,0 +1,132 @@
+import threading
+import time
+from sqlalchemy import select, update
+from models import db, CacheVersion
+
+# --- Versioned In-Process Caches ---
+# Each process keeps its own copy of the data. After `ttl` seconds the copy is
+# revalidated against a shared CacheVersion row (one primary-key lookup) and only
+# reloaded when another worker has bumped the version.
+
+CATALOG_VERSION = 'catalog' # Bumped by every write that changes what /medicines and /healthcare show
+
+def get_version(name):
+    return db.session.execute(select(CacheVersion.version).where(CacheVersion.name == name)).scalar() or 0
+
+def bump_version(name):
+    """Increments a shared cache version inside the current transaction (caller commits)."""
+    updated = db.session.execute(
+        update(CacheVersion).where(CacheVersion.name == name).values(version=CacheVersion.version + 1)
+    ).rowcount
+    if not updated:
+        db.session.add(CacheVersion(name=name, version=1))
+
+
+class VersionedCache:
+    def __init__(self, name, loader, ttl=60):
+        self.name = name
+        self.loader = loader
+        self.ttl = ttl
+        self.value = None
+        self.version = None
+        self.expires_at = 0
+        self.lock = threading.Lock()
+
+    def get(self):
+        now = time.monotonic()
+        if self.version is not None and now < self.expires_at:
+            return self.value
+
+        with self.lock:
+            if self.version is not None and now < self.expires_at:
+                return self.value
+            current = get_version(self.name)
+            if current != self.version:
+                self.value = self.loader()
+                self.version = current
+            self.expires_at = now + self.ttl
+            return self.value
+
+    def invalidate(self):
+        """Drops the local copy and bumps the shared version so other workers reload too."""
+        bump_version(self.name)
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.value = None
+            self.version = None
+            self.expires_at = 0
+
+
+class VersionedKeyCache:
+    """Per-key variant (e.g. users by id): entries stay valid until the shared version
+    changes, revalidated every `ttl` seconds, with `max_age` as a safety net for
+    writers that do not bump the version."""
+
+    def __init__(self, name, loader, ttl=30, max_age=600, max_entries=10000):
+        self.name = name
+        self.loader = loader
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.entries = {} # key -> (value, loaded_at)
+        self.version = None
+        self.checked_until = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        if now >= self.checked_until:
+            current = get_version(self.name)
+            with self.lock:
+                if current != self.version:
+                    self.entries.clear()
+                    self.version = current
+                self.checked_until = now + self.ttl
+
+        entry = self.entries.get(key)
+        if entry and now - entry[1] < self.max_age:
+            return entry[0]
+
+        value = self.loader(key)
+        if value is not None:
+            with self.lock:
+                if len(self.entries) >= self.max_entries:
+                    self.entries.pop(next(iter(self.entries))) # Drop the oldest entry
+                self.entries[key] = (value, now)
+        return value
+
+    def invalidate(self, key=None):
+        """Bumps the shared version (caller commits) and drops the local entry, or all of them."""
+        bump_version(self.name)
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+
+class VersionCounter:
+    """Reads one shared version at most once per `ttl` seconds per process, so callers
+    (e.g. HTTP validators) can check it on every request without a query."""
+
+    def __init__(self, name, ttl=2):
+        self.name = name
+        self.ttl = ttl
+        self.value = None
+        self.expires_at = 0
+        self.lock = threading.Lock()
+
+    def get(self):
+        now = time.monotonic()
+        if self.value is None or now >= self.expires_at:
+            value = get_version(self.name)
+            with self.lock:
+                self.value, self.expires_at = value, now + self.ttl
+        return self.value
+
+    def bump(self):
+        """Increments the shared version (caller commits); the next get() re-reads it."""
+        bump_version(self.name)
+        self.expires_at = 0
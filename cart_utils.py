@@ -0,0 +1,149 @@
+from collections import namedtuple
+from sqlalchemy import select, update, delete, case, func
+from sqlalchemy.orm import joinedload
+from models import db, Medicine, CartItem
+from db_utils import upsert_increment
+
+# One hydrated cart line: the Medicine row, requested quantity and line total
+CartLine = namedtuple('CartLine', ['medicine', 'quantity', 'total'])
+
+# Whole cart as rendered by cart.html / checkout.html and consumed by place_order
+CartView = namedtuple('CartView', ['items', 'total_amount'])
+
+
+# --- Cart Store ---
+# Carts live in CartItem, keyed by user. Every mutation is a single-row write
+# (an atomic upsert or a DELETE); callers commit.
+
+def cart_quantities(user_id):
+    """{medicine_id: quantity} for the user's cart, in the order items were added."""
+    return dict(db.session.execute(
+        select(CartItem.medicine_id, CartItem.quantity)
+        .where(CartItem.user_id == user_id)
+        .order_by(CartItem.added_at, CartItem.id)
+    ).all())
+
+
+def add_cart_item(user_id, medicine_id, quantity):
+    """Adds quantity to the cart line, creating it if needed (INSERT ... ON CONFLICT DO UPDATE)."""
+    upsert_increment(CartItem, {'user_id': user_id, 'medicine_id': medicine_id}, {'quantity': quantity})
+
+
+def remove_cart_item(user_id, medicine_id):
+    """Deletes one cart line; returns True if it existed."""
+    return db.session.execute(
+        delete(CartItem).where(CartItem.user_id == user_id, CartItem.medicine_id == medicine_id)
+    ).rowcount > 0
+
+
+def set_cart_quantity(user_id, medicine_id, quantity):
+    """Sets the quantity of an existing cart line (0 removes it); returns False if the line does not exist."""
+    if quantity <= 0:
+        return remove_cart_item(user_id, medicine_id)
+    return db.session.execute(
+        update(CartItem).where(CartItem.user_id == user_id, CartItem.medicine_id == medicine_id).values(quantity=quantity)
+    ).rowcount > 0
+
+
+def cart_summary(user_id):
+    """Line count, unit count and total for the cart badge and JSON API, in one aggregate query."""
+    lines, units, total = db.session.execute(
+        select(func.count(CartItem.id), func.coalesce(func.sum(CartItem.quantity), 0),
+               func.coalesce(func.sum(CartItem.quantity * Medicine.price), 0))
+        .join(Medicine, Medicine.id == CartItem.medicine_id)
+        .where(CartItem.user_id == user_id)
+    ).one()
+    return {'lines': lines, 'count': units, 'total_amount': round(total, 2)}
+
+
+def clear_cart(user_id):
+    db.session.execute(delete(CartItem).where(CartItem.user_id == user_id))
+
+
+def merge_cart(user_id, quantities):
+    """Adds a {medicine_id: quantity} cart (e.g. a legacy session cart) to the user's stored cart.
+
+    Lines whose id or quantity is not an integer, or whose medicine has since been
+    deleted, are dropped (one IN (...) query checks which medicines still exist).
+    """
+    wanted = {}
+    for med_id, qty in quantities.items():
+        try:
+            med_id, qty = int(med_id), int(qty)
+        except (TypeError, ValueError):
+            continue
+        if qty > 0:
+            wanted[med_id] = wanted.get(med_id, 0) + qty
+    if not wanted:
+        return
+    existing = set(db.session.execute(select(Medicine.id).where(Medicine.id.in_(wanted))).scalars())
+    for med_id, qty in wanted.items():
+        if med_id in existing:
+            add_cart_item(user_id, med_id, qty)
+
+
+def hydrate_cart(cart_session):
+    """Loads every medicine in a {medicine_id: quantity} cart with a single IN (...) query."""
+    if not cart_session:
+        return CartView([], 0)
+
+    # Ids may be strings (legacy session JSON) or ints (cart_quantities)
+    ids = [int(med_id) for med_id in cart_session.keys()]
+    meds = Medicine.query.options(joinedload(Medicine.category)).filter(Medicine.id.in_(ids)).all()
+    meds_by_id = {med.id: med for med in meds}
+
+    items = []
+    total_amount = 0
+    # Keep the order the customer added items in
+    for med_id, qty in cart_session.items():
+        med = meds_by_id.get(int(med_id))
+        if med:
+            line_total = med.price * qty
+            items.append(CartLine(med, qty, line_total))
+            total_amount += line_total
+
+    return CartView(items, total_amount)
+
+
+def reserve_stock(quantities):
+    """Atomically decrements stock for {medicine_id: qty} inside the current transaction.
+
+    Each line only succeeds if the medicine is still available (not swept as
+    expired) and enough stock is left at the moment of the UPDATE
+    (quantity >= qty is checked by the database, not in Python), so concurrent
+    checkouts on different workers can never oversell. Returns the set of
+    medicine ids that were reserved; the caller rolls back if it needs all of them.
+    """
+    wanted = {med_id: qty for med_id, qty in quantities.items() if qty > 0}
+    if not wanted:
+        return set()
+
+    dialect = db.engine.dialect
+    if dialect.name == 'postgresql':
+        # Lock the rows in id order first so two overlapping carts cannot deadlock
+        db.session.execute(
+            select(Medicine.id).where(Medicine.id.in_(wanted)).order_by(Medicine.id).with_for_update()
+        ).all()
+
+    if dialect.update_returning:
+        # One conditional UPDATE for the whole cart; RETURNING tells us which lines had stock
+        qty_for = case(wanted, value=Medicine.id)
+        stmt = (update(Medicine)
+                .where(Medicine.id.in_(wanted), Medicine.availability == True, Medicine.quantity >= qty_for)
+                .values(quantity=Medicine.quantity - qty_for)
+                .returning(Medicine.id)
+                .execution_options(synchronize_session=False))
+        return set(db.session.execute(stmt).scalars())
+
+    # Databases without UPDATE ... RETURNING: same conditional UPDATE, one per line
+    reserved = set()
+    for med_id, qty in wanted.items():
+        result = db.session.execute(
+            update(Medicine)
+            .where(Medicine.id == med_id, Medicine.availability == True, Medicine.quantity >= qty)
+            .values(quantity=Medicine.quantity - qty)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            reserved.add(med_id)
+    return reserved
@@ -0,0 +1,30 @@
+from sqlalchemy import update, insert
+from sqlalchemy.dialects import sqlite, postgresql
+from models import db
+
+# --- Shared Write Helpers ---
+# Statement builders used by more than one feature module (sales rollups, carts).
+
+
+def upsert_increment(model, keys, amounts, labels=None):
+    """INSERT the row or add `amounts` to an existing one, atomically (ON CONFLICT DO UPDATE).
+
+    `labels` are plain values (e.g. a medicine name) written as-is on insert and update.
+    """
+    labels = labels or {}
+    dialect = db.engine.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        stmt = dialect_insert(model).values(**keys, **amounts, **labels)
+        set_ = {col: getattr(model, col) + stmt.excluded[col] for col in amounts}
+        set_.update({col: stmt.excluded[col] for col in labels})
+        db.session.execute(stmt.on_conflict_do_update(index_elements=list(keys), set_=set_))
+        return
+
+    # Other databases: UPDATE first, INSERT when the row does not exist yet
+    values = {col: getattr(model, col) + value for col, value in amounts.items()}
+    updated = db.session.execute(
+        update(model).where(*[getattr(model, k) == v for k, v in keys.items()]).values(**values, **labels)
+    ).rowcount
+    if not updated:
+        db.session.execute(insert(model).values(**keys, **amounts, **labels))
@@ -1,34 +1,12 @@
-from app import app, db, Medicine
+import sys
+from app import app
+from maintenance import dedupe_medicines
 
-def global_deduplicate():
+def global_deduplicate(dry_run=False):
+    """Merges same-named medicines regardless of store, except groups shared by several stores (reported, left alone)."""
     with app.app_context():
-        print("Starting GLOBAL deduplication...")
-        
-        meds = Medicine.query.all()
-        # Track seen names
-        seen_names = set()
-        duplicates = []
-        
-        count_kept = 0
-        
-        for med in meds:
-            name = med.name.strip().lower()
-            if name in seen_names:
-                duplicates.append(med)
-            else:
-                seen_names.add(name)
-                count_kept += 1
-                
-        print(f"Found {len(duplicates)} duplicates. Keeping {count_kept} unique medicines.")
-        
-        if duplicates:
-            print("Deleting duplicates...")
-            for dup in duplicates:
-                db.session.delete(dup)
-            db.session.commit()
-            print("Duplicates deleted.")
-        else:
-            print("No duplicates found.")
+        print("Starting GLOBAL deduplication..." + (" (dry run)" if dry_run else ""))
+        dedupe_medicines(per_store=False, dry_run=dry_run)
 
 if __name__ == "__main__":
-    global_deduplicate()
+    global_deduplicate(dry_run='--dry-run' in sys.argv)
@@ -0,0 +1,64 @@
+import threading
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import update, delete, insert, select, literal, func
+from models import db, Medicine, NearExpiryItem, NEAR_EXPIRY_DAYS
+from cache_utils import bump_version, CATALOG_VERSION
+
+SWEEP_LOCK_ID = 7201 # pg_advisory_xact_lock key shared by every worker's sweeper
+
+def sweep_expiry():
+    """One sweep: flag expired stock unavailable and rebuild the near-expiry worklist.
+
+    Both steps are set-based (one UPDATE, one DELETE + INSERT ... SELECT) and run in
+    a single transaction, so the cost does not depend on how many rows change.
+    Sweeps are serialized, so two workers sweeping at once cannot both rebuild the
+    worklist and leave duplicate rows.
+    """
+    start = time.perf_counter()
+    today = date.today()
+
+    if db.engine.dialect.name == 'postgresql':
+        # Held until commit; a concurrent sweep waits here, then finds nothing left to flip
+        db.session.execute(select(func.pg_advisory_xact_lock(SWEEP_LOCK_ID)))
+    # SQLite needs no lock: the first UPDATE takes the database write lock until commit
+
+    expired = db.session.execute(
+        update(Medicine)
+        .where(Medicine.expiry_date < today, Medicine.availability == True)
+        .values(availability=False)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if expired:
+        bump_version(CATALOG_VERSION) # Expired stock drops out of the customer catalog
+
+    db.session.execute(delete(NearExpiryItem))
+    worklist = db.session.execute(
+        insert(NearExpiryItem).from_select(
+            ['user_id', 'medicine_id', 'medicine_name', 'expiry_date', 'quantity', 'status', 'refreshed_at'],
+            select(Medicine.user_id, Medicine.id, Medicine.name, Medicine.expiry_date, Medicine.quantity,
+                   Medicine.expiry_status, literal(datetime.utcnow()))
+            .where(Medicine.expiry_date <= today + timedelta(days=NEAR_EXPIRY_DAYS), Medicine.quantity > 0)
+        )
+    ).rowcount
+
+    db.session.commit()
+    return {'expired_marked': expired, 'worklist_rows': worklist, 'seconds': time.perf_counter() - start}
+
+def start_expiry_sweeper(app, interval):
+    """Runs sweep_expiry() every `interval` seconds on a daemon thread (first run immediately)."""
+    def run():
+        while True:
+            with app.app_context():
+                try:
+                    result = sweep_expiry()
+                    print(f"Expiry sweep: {result['expired_marked']} marked unavailable, "
+                          f"{result['worklist_rows']} on near-expiry worklist ({result['seconds'] * 1000:.0f} ms)")
+                except Exception as e:
+                    print(f"Expiry sweep failed: {e}")
+                    db.session.rollback()
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name='expiry-sweeper', daemon=True)
+    thread.start()
+    return thread
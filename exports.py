@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+from sqlalchemy import select
+from models import db, Medicine, Category, Order, OrderItem
+from inventory_import import IMPORT_FIELDS
+
+# --- Streaming Exports ---
+# Generators that turn a server-side cursor (yield_per) into CSV or NDJSON text chunks.
+# The header goes out before the query runs, and only one chunk of rows is in memory.
+
+EXPORT_CHUNK_ROWS = 1000
+
+MEDICINE_EXPORT_FIELDS = ['id'] + IMPORT_FIELDS # Same columns the bulk import reads
+ORDER_EXPORT_FIELDS = ['order_id', 'order_date', 'status', 'payment_method', 'total_amount',
+                       'full_name', 'city', 'pincode',
+                       'medicine_id', 'medicine_name', 'quantity', 'price']
+
+
+def stream_rows(stmt):
+    """Runs stmt on a server-side cursor, fetching EXPORT_CHUNK_ROWS at a time.
+
+    The row generators below only execute once iteration starts, inside the response.
+    """
+    return db.session.execute(stmt.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+
+
+def medicine_rows(manager_id):
+    stmt = (select(Medicine.id, Medicine.name, Category.name, Medicine.price, Medicine.quantity,
+                   Medicine.expiry_date, Medicine.medicine_type, Medicine.unit, Medicine.image_url,
+                   Medicine.composition)
+            .join(Category, Medicine.category_id == Category.id)
+            .where(Medicine.user_id == manager_id)
+            .order_by(Medicine.id))
+    yield from stream_rows(stmt)
+
+
+def order_line_rows(manager_id):
+    """One row per order item (orders without items appear once with empty item columns)."""
+    stmt = (select(Order.id, Order.order_date, Order.status, Order.payment_method, Order.total_amount,
+                   Order.full_name, Order.city, Order.pincode,
+                   OrderItem.medicine_id, OrderItem.medicine_name, OrderItem.quantity, OrderItem.price)
+            .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+            .where(Order.store_manager_id == manager_id)
+            .order_by(Order.id, OrderItem.id))
+    yield from stream_rows(stmt)
+
+
+def csv_chunks(fields, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue() # First bytes go out before the query runs
+    buffer.seek(0)
+    buffer.truncate()
+
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_chunks(records):
+    lines = []
+    for count, record in enumerate(records, 1):
+        lines.append(json.dumps(record, default=str))
+        if count == 1 or len(lines) == EXPORT_CHUNK_ROWS: # Send the first record as soon as it is read
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def export_medicines(manager_id, fmt):
+    if fmt == 'csv':
+        return csv_chunks(MEDICINE_EXPORT_FIELDS, medicine_rows(manager_id))
+    return ndjson_chunks(dict(zip(MEDICINE_EXPORT_FIELDS, row)) for row in medicine_rows(manager_id))
+
+
+def group_orders(rows):
+    """Folds consecutive order-line rows (ordered by order id) into one record per order."""
+    current = None
+    for row in rows:
+        if current is None or current['order_id'] != row[0]:
+            if current is not None:
+                yield current
+            current = dict(zip(ORDER_EXPORT_FIELDS[:8], row[:8]), items=[])
+        if row[8] is not None:
+            current['items'].append(dict(zip(ORDER_EXPORT_FIELDS[8:], row[8:])))
+    if current is not None:
+        yield current
+
+
+def export_orders(manager_id, fmt):
+    if fmt == 'csv':
+        return csv_chunks(ORDER_EXPORT_FIELDS, order_line_rows(manager_id))
+    return ndjson_chunks(group_orders(order_line_rows(manager_id)))
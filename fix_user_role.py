@@ -1,4 +1,4 @@
-from app import app, db, User
+from app import app, db, User, user_cache
 
 def check_latish():
     with app.app_context():
@@ -8,6 +8,7 @@ def check_latish():
             if user.role != 'store_manager':
                 print("Updating role to 'store_manager'...")
                 user.role = 'store_manager'
+                user_cache.invalidate(user.id) # Running workers drop their cached copy
                 db.session.commit()
                 print("Role updated successfully.")
         else:
@@ -0,0 +1,151 @@
+import csv
+import json
+import time
+from collections import namedtuple
+from datetime import date
+from itertools import islice
+from sqlalchemy import select, insert, update, bindparam
+from models import db, Medicine, Category
+from cache_utils import bump_version, CATALOG_VERSION
+
+# --- Bulk Inventory Import ---
+# Rows are read lazily from a CSV or JSON Lines stream and written batch by batch:
+# one SELECT to find which names the store already has, one executemany INSERT and
+# one executemany UPDATE, then a commit. Only the current batch is held in memory.
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 50
+
+IMPORT_FIELDS = ['name', 'category', 'price', 'quantity', 'expiry_date',
+                 'medicine_type', 'unit', 'image_url', 'composition']
+
+ImportResult = namedtuple('ImportResult', ['inserted', 'updated', 'rejected', 'errors', 'seconds'])
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_rows(stream, fmt):
+    """Yields raw dicts from a text stream; fmt is 'csv' or 'jsonl'."""
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    elif fmt == 'jsonl':
+        for line in stream:
+            line = line.strip()
+            if line:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                yield row if isinstance(row, dict) else {'__invalid__': line[:80]}
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def guess_format(filename):
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def clean_row(raw, category_ids, today):
+    """Validates one raw row against Category and the Medicine columns; returns column values."""
+    if '__invalid__' in raw:
+        raise RowError("not valid JSON")
+
+    def text(field, max_len=None):
+        value = raw.get(field)
+        value = str(value).strip() if value is not None else ''
+        if max_len and len(value) > max_len:
+            raise RowError(f"{field} longer than {max_len} characters")
+        return value or None
+
+    name = text('name', 100)
+    if not name:
+        raise RowError("name is required")
+
+    category = text('category')
+    category_id = category_ids.get(category.lower()) if category else None
+    if category_id is None:
+        raise RowError(f"unknown category {category!r}")
+
+    try:
+        price = float(raw.get('price'))
+        quantity = int(raw.get('quantity'))
+    except (TypeError, ValueError):
+        raise RowError("price and quantity must be numbers")
+    if price < 0 or quantity < 0:
+        raise RowError("price and quantity cannot be negative")
+
+    try:
+        expiry_date = date.fromisoformat(text('expiry_date') or '')
+    except ValueError:
+        raise RowError("expiry_date must be YYYY-MM-DD")
+
+    return {
+        'name': name,
+        'category_id': category_id,
+        'price': price,
+        'quantity': quantity,
+        'expiry_date': expiry_date,
+        'availability': expiry_date >= today,
+        'medicine_type': text('medicine_type', 50) or 'Tablet',
+        'unit': text('unit', 20) or 'Strip',
+        'image_url': text('image_url', 500),
+        'composition': text('composition'),
+    }
+
+
+def write_batch(user_id, rows):
+    """Upserts one batch keyed on (user_id, name) and commits; returns (inserted, updated)."""
+    by_name = {row['name']: row for row in rows} # Last row wins inside a batch
+    existing = dict(db.session.execute(
+        select(Medicine.name, Medicine.id).where(Medicine.user_id == user_id, Medicine.name.in_(by_name))
+    ).all())
+
+    new_rows = [dict(row, user_id=user_id) for name, row in by_name.items() if name not in existing]
+    changed_rows = [dict(row, medicine_id=existing[name]) for name, row in by_name.items() if name in existing]
+    # Core executemany on the table: the ORM bulk path costs more than the SQL here
+    table = Medicine.__table__
+    if new_rows:
+        db.session.execute(insert(table), new_rows)
+    if changed_rows:
+        db.session.execute(update(table).where(table.c.id == bindparam('medicine_id')), changed_rows)
+    bump_version(CATALOG_VERSION)
+    db.session.commit()
+    return len(new_rows), len(changed_rows)
+
+
+def import_medicines(stream, fmt, user_id, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Streams rows from `stream` into the store of `user_id`.
+
+    Existing medicines with the same name are updated in place (price, stock,
+    expiry, ...); invalid rows are skipped and reported with their line number.
+    """
+    started = time.perf_counter()
+    category_ids = {name.lower(): cat_id for cat_id, name in db.session.execute(select(Category.id, Category.name))}
+    today = date.today()
+    inserted = updated = rejected = 0
+    errors = []
+
+    rows = enumerate(read_rows(stream, fmt), start=2 if fmt == 'csv' else 1) # Line numbers as seen in an editor
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+
+        batch = []
+        for line_no, raw in chunk:
+            try:
+                batch.append(clean_row(raw, category_ids, today))
+            except RowError as e:
+                rejected += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(f"line {line_no}: {e}")
+        if batch:
+            added, changed = write_batch(user_id, batch)
+            inserted += added
+            updated += changed
+        if progress:
+            progress(inserted, updated, rejected, time.perf_counter() - started)
+
+    return ImportResult(inserted, updated, rejected, errors, time.perf_counter() - started)
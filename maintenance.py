@@ -0,0 +1,216 @@
+import random
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+from sqlalchemy import (Table, Column, Integer, MetaData, select, update, delete, insert, func, case,
+                        and_, or_, literal)
+from models import db, Medicine, OrderItem, CartItem, NearExpiryItem, NEAR_EXPIRY_DAYS
+from cache_utils import bump_version, CATALOG_VERSION
+
+# --- Set-Based Maintenance ---
+# Every step runs as a handful of UPDATE/DELETE statements per id range instead of
+# loading Medicine rows into the session. Ranges are committed one by one, so a large
+# table never holds one huge transaction, and dry_run=True only counts what would change.
+
+DEFAULT_CHUNK_SIZE = 5000
+
+StepResult = namedtuple('StepResult', ['step', 'rows', 'seconds', 'dry_run'])
+
+
+def id_ranges(conn, column, chunk_size):
+    """Yields (low, high) bounds covering column's values in chunk_size-wide id windows."""
+    low, high = conn.execute(select(func.min(column), func.max(column))).one()
+    if low is None:
+        return
+    for start in range(low, high + 1, chunk_size):
+        yield start, start + chunk_size - 1
+
+
+def report(step, done, total, rows, started):
+    print(f"  [{step}] chunk {done}/{total}: {rows} rows ({time.perf_counter() - started:.2f}s elapsed)")
+
+
+def finish(step, rows, started, dry_run):
+    if rows and not dry_run:
+        bump_version(CATALOG_VERSION) # Cached catalog pages are stale now
+        db.session.commit()
+    result = StepResult(step, rows, time.perf_counter() - started, dry_run)
+    verb = "would change" if dry_run else "changed"
+    print(f"[{step}] {verb} {rows} rows in {result.seconds:.2f}s")
+    return result
+
+
+def dedupe_plan_table():
+    # Scratch table for one dedupe run: every row of a duplicate group with its group's keeper
+    return Table('dedupe_plan', MetaData(),
+                 Column('id', Integer, primary_key=True),
+                 Column('keeper_id', Integer, nullable=False, index=True),
+                 Column('total_quantity', Integer, nullable=False),
+                 prefixes=['TEMPORARY'])
+
+
+def dedupe_medicines(per_store=True, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE, user_ids=None):
+    """Merges medicines with the same lower(name) (per store by default).
+
+    user_ids limits the run to those stores' medicines (default: every row).
+
+    The copy with the latest expiry is kept, gets the summed quantity, and inherits
+    the order items and cart lines of the copies that are deleted. With per_store=False,
+    groups that span several stores are skipped and reported: merging them would move
+    stock and order history into another manager's store.
+    """
+    started = time.perf_counter()
+    name_key = func.lower(func.trim(Medicine.name))
+    group = [Medicine.user_id, name_key] if per_store else [name_key]
+    window = dict(partition_by=group)
+    ranked = select(
+        Medicine.id,
+        func.first_value(Medicine.id).over(partition_by=group,
+                                           order_by=[Medicine.expiry_date.desc(), Medicine.id.desc()]).label('keeper_id'),
+        func.sum(Medicine.quantity).over(**window).label('total_quantity'),
+        func.count().over(**window).label('copies'),
+        func.count(Medicine.user_id).over(**window).label('owned'),
+        func.min(Medicine.user_id).over(**window).label('min_owner'),
+        func.max(Medicine.user_id).over(**window).label('max_owner')
+    )
+    if user_ids is not None:
+        ranked = ranked.where(Medicine.user_id.in_(user_ids))
+    ranked = ranked.subquery()
+    # All copies unowned, or all owned by the same store
+    one_store = or_(ranked.c.owned == 0, and_(ranked.c.owned == ranked.c.copies, ranked.c.min_owner == ranked.c.max_owner))
+
+    plan = dedupe_plan_table()
+    with db.engine.connect() as conn:
+        plan.drop(conn, checkfirst=True)
+        plan.create(conn)
+        conn.execute(insert(plan).from_select(
+            ['id', 'keeper_id', 'total_quantity'],
+            select(ranked.c.id, ranked.c.keeper_id, ranked.c.total_quantity).where(ranked.c.copies > 1, one_store)
+        ))
+        if not per_store:
+            skipped = conn.execute(select(func.count()).where(ranked.c.copies > 1, ~one_store)).scalar()
+            if skipped:
+                print(f"[dedupe] skipped {skipped} rows in duplicate groups that span several stores")
+        rows, groups = conn.execute(select(func.count(plan.c.id), func.count(func.distinct(plan.c.keeper_id)))).one()
+        removable = rows - groups
+        print(f"[dedupe] {groups} duplicate groups, {removable} rows to merge away "
+              f"(planned in {time.perf_counter() - started:.2f}s)")
+
+        if dry_run or not removable:
+            plan.drop(conn)
+            conn.commit()
+            return finish('dedupe', removable, started, dry_run)
+
+        ranges = list(id_ranges(conn, plan.c.keeper_id, chunk_size))
+        deleted = 0
+        for done, (low, high) in enumerate(ranges, 1):
+            in_chunk = plan.c.keeper_id.between(low, high)
+            losers = select(plan.c.id).where(in_chunk, plan.c.id != plan.c.keeper_id)
+
+            conn.execute(
+                update(Medicine)
+                .where(Medicine.id.in_(select(plan.c.id).where(in_chunk, plan.c.id == plan.c.keeper_id)))
+                .values(quantity=select(plan.c.total_quantity).where(plan.c.id == Medicine.id).scalar_subquery())
+            )
+            conn.execute(
+                update(OrderItem)
+                .where(OrderItem.medicine_id.in_(losers))
+                .values(medicine_id=select(plan.c.keeper_id).where(plan.c.id == OrderItem.medicine_id).scalar_subquery())
+            )
+            # Cart lines: one line per customer and keeper, with the quantities summed
+            # Uncorrelated: cart_item and dedupe_plan are also in the FROM of the statements below
+            in_carts = select(CartItem.user_id).where(CartItem.medicine_id.in_(losers.correlate(None))).correlate(None)
+            merged = conn.execute(
+                select(CartItem.user_id, plan.c.keeper_id, func.sum(CartItem.quantity), func.min(CartItem.added_at))
+                .join(plan, plan.c.id == CartItem.medicine_id)
+                .where(in_chunk, CartItem.user_id.in_(in_carts))
+                .group_by(CartItem.user_id, plan.c.keeper_id)
+            ).all()
+            if merged:
+                conn.execute(delete(CartItem).where(
+                    CartItem.medicine_id.in_(select(plan.c.id).where(in_chunk)), CartItem.user_id.in_(in_carts)))
+                conn.execute(insert(CartItem), [{'user_id': user_id, 'medicine_id': keeper_id, 'quantity': qty,
+                                                 'added_at': added_at} for user_id, keeper_id, qty, added_at in merged])
+            conn.execute(delete(NearExpiryItem).where(NearExpiryItem.medicine_id.in_(losers)))
+            rows = conn.execute(delete(Medicine).where(Medicine.id.in_(losers))).rowcount
+            conn.commit()
+            deleted += rows
+            report('dedupe', done, len(ranges), rows, started)
+
+        plan.drop(conn)
+        conn.commit()
+    return finish('dedupe', deleted, started, dry_run)
+
+
+def reassign_medicines(to_user_id, from_user_id=None, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Moves medicines to another store: those of from_user_id, or every row not already
+    owned by to_user_id (including unowned rows) when from_user_id is None."""
+    started = time.perf_counter()
+    if from_user_id is None:
+        owned_elsewhere = or_(Medicine.user_id != to_user_id, Medicine.user_id.is_(None))
+    else:
+        owned_elsewhere = Medicine.user_id == from_user_id
+
+    with db.engine.connect() as conn:
+        if dry_run:
+            rows = conn.execute(select(func.count(Medicine.id)).where(owned_elsewhere)).scalar()
+            return finish('reassign', rows, started, dry_run)
+
+        ranges = list(id_ranges(conn, Medicine.id, chunk_size))
+        moved = 0
+        for done, (low, high) in enumerate(ranges, 1):
+            rows = conn.execute(
+                update(Medicine)
+                .where(Medicine.id.between(low, high), owned_elsewhere)
+                .values(user_id=to_user_id)
+            ).rowcount
+            # Keep the materialized expiry worklist pointing at the new owner
+            conn.execute(
+                update(NearExpiryItem)
+                .where(NearExpiryItem.medicine_id.between(low, high))
+                .values(user_id=select(Medicine.user_id).where(Medicine.id == NearExpiryItem.medicine_id).scalar_subquery())
+            )
+            conn.commit()
+            moved += rows
+            report('reassign', done, len(ranges), rows, started)
+    return finish('reassign', moved, started, dry_run)
+
+
+def enforce_status_mix(dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    """Gives the inventory a test mix: ~10% out of stock, ~10% expired, ~10% near expiry,
+    the rest in stock with a safe expiry. Rows are bucketed by a salted hash of their id."""
+    started = time.perf_counter()
+    salt = random.Random(seed).randrange(10)
+    bucket = (Medicine.id * 7919 + literal(salt)) % 10 # 0 out of stock, 1 expired, 2 near expiry
+    today = date.today()
+    rest = bucket >= 3
+
+    with db.engine.connect() as conn:
+        if dry_run:
+            kind = case((bucket < 3, bucket), else_=3)
+            counts = dict(conn.execute(select(kind, func.count()).group_by(kind)).all())
+            print(f"[status-mix] out of stock {counts.get(0, 0)}, expired {counts.get(1, 0)}, "
+                  f"near expiry {counts.get(2, 0)}, safe {counts.get(3, 0)}")
+            return finish('status-mix', sum(counts.values()), started, dry_run)
+
+        ranges = list(id_ranges(conn, Medicine.id, chunk_size))
+        changed = 0
+        for done, (low, high) in enumerate(ranges, 1):
+            rows = conn.execute(
+                update(Medicine)
+                .where(Medicine.id.between(low, high))
+                .values(
+                    quantity=case((bucket == 0, 0), (and_(rest, Medicine.quantity == 0), 10), else_=Medicine.quantity),
+                    expiry_date=case(
+                        (bucket == 1, today - timedelta(days=30)),
+                        (bucket == 2, today + timedelta(days=15)),
+                        (and_(rest, Medicine.expiry_date < today + timedelta(days=NEAR_EXPIRY_DAYS)),
+                         today + timedelta(days=365)),
+                        else_=Medicine.expiry_date),
+                    availability=case((rest, True), else_=Medicine.availability)
+                )
+            ).rowcount
+            conn.commit()
+            changed += rows
+            report('status-mix', done, len(ranges), rows, started)
+    return finish('status-mix', changed, started, dry_run)
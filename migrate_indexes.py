@@ -0,0 +1,17 @@
+from app import app, db
+
+def add_secondary_indexes():
+    """Creates any index declared in models.py that an existing database is missing (SQLite or Postgres)."""
+    with app.app_context():
+        print(f"Connecting to database: {db.engine.url.render_as_string(hide_password=True)}")
+
+        for table in db.metadata.sorted_tables:
+            for index in sorted(table.indexes, key=lambda i: i.name):
+                try:
+                    index.create(bind=db.engine, checkfirst=True)
+                    print(f"Index '{index.name}' on {table.name} is in place.")
+                except Exception as e:
+                    print(f"Error creating index '{index.name}': {e}")
+
+if __name__ == "__main__":
+    add_secondary_indexes()
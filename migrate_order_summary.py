@@ -0,0 +1,48 @@
+from app import app, db
+from models import Order, OrderItem, summarize_order_items
+from sqlalchemy import inspect, text, select, update, bindparam
+
+BATCH_SIZE = 1000
+
+def add_order_summary_columns():
+    """Adds Order.item_count / items_summary to an existing database and fills them for old orders."""
+    with app.app_context():
+        print(f"Connecting to database: {db.engine.url.render_as_string(hide_password=True)}")
+        existing = {col['name'] for col in inspect(db.engine).get_columns('order')}
+        for name, ddl in [('item_count', 'INTEGER'), ('items_summary', 'VARCHAR(500)')]:
+            if name in existing:
+                print(f"Column '{name}' already exists.")
+            else:
+                db.session.execute(text(f'ALTER TABLE "order" ADD COLUMN {name} {ddl}'))
+                print(f"Column '{name}' added successfully.")
+        db.session.commit()
+
+        # Backfill orders placed before the columns existed, a batch of orders at a time
+        filled = 0
+        last_id = 0
+        while True:
+            order_ids = db.session.execute(
+                select(Order.id).where(Order.id > last_id, Order.item_count.is_(None)).order_by(Order.id).limit(BATCH_SIZE)
+            ).scalars().all()
+            if not order_ids:
+                break
+            lines = {order_id: [] for order_id in order_ids}
+            for order_id, name, quantity in db.session.execute(
+                    select(OrderItem.order_id, OrderItem.medicine_name, OrderItem.quantity)
+                    .where(OrderItem.order_id.in_(order_ids)).order_by(OrderItem.id)):
+                lines[order_id].append((name, quantity))
+
+            table = Order.__table__
+            db.session.execute(
+                update(table).where(table.c.id == bindparam('order_id')),
+                [{'order_id': order_id, 'item_count': len(items), 'items_summary': summarize_order_items(items)}
+                 for order_id, items in lines.items()])
+            db.session.commit()
+            filled += len(order_ids)
+            last_id = order_ids[-1]
+            print(f"  Backfilled {filled} orders...")
+
+        print(f"Order summaries in place ({filled} orders backfilled).")
+
+if __name__ == "__main__":
+    add_order_summary_columns()
@@ -1,9 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import case
+from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime, timedelta, date
 
 db = SQLAlchemy()
 
+NEAR_EXPIRY_DAYS = 60 # Stock expiring within this many days is flagged "Near Expiry"
+
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(100), unique=True, nullable=False)
@@ -20,6 +24,11 @@ class Category(db.Model):
     name = db.Column(db.String(100), unique=True, nullable=False)
     medicines = db.relationship('Medicine', backref='category', lazy=True)
 
+class StarterSeed(db.Model):
+    # One row per manager whose starter inventory was injected; the primary key makes seeding run once
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    seeded_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 class Medicine(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -37,18 +46,38 @@ class Medicine(db.Model):
     image_url = db.Column(db.String(500), nullable=True) # URL to medicine image
     composition = db.Column(db.Text, nullable=True) # Actual active ingredients + strength
 
-    @property
+    # Indexes follow the access paths in app.py: catalog pages are keyset-paged on (name, id)
+    # after an optional store/category/type filter, expiry reports range over expiry_date
+    __table_args__ = (
+        db.Index('ix_medicine_name_id', 'name', 'id'),
+        db.Index('ix_medicine_user_name_id', 'user_id', 'name', 'id'),
+        db.Index('ix_medicine_category_name_id', 'category_id', 'name', 'id'),
+        db.Index('ix_medicine_type_name_id', 'medicine_type', 'name', 'id'),
+        db.Index('ix_medicine_expiry_date', 'expiry_date'),
+    )
+
+    @hybrid_property
     def expiry_status(self):
         # Ensure comparison is date vs date
         today = date.today()
         # expiry_date is usually date object from SQLAlchemy
         if self.expiry_date < today:
             return "Expired"
-        elif self.expiry_date <= today + timedelta(days=60):
+        elif self.expiry_date <= today + timedelta(days=NEAR_EXPIRY_DAYS):
             return "Near Expiry"
         else:
             return "Safe"
 
+    @expiry_status.expression
+    def expiry_status(cls):
+        # Same rules as a SQL CASE, so queries can filter/group by status in the database
+        today = date.today()
+        return case(
+            (cls.expiry_date < today, "Expired"),
+            (cls.expiry_date <= today + timedelta(days=NEAR_EXPIRY_DAYS), "Near Expiry"),
+            else_="Safe"
+        )
+
 class Order(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True) # Nullable for guest checkout if needed
@@ -66,9 +95,28 @@ class Order(db.Model):
     city = db.Column(db.String(50), nullable=True)
     state = db.Column(db.String(50), nullable=True)
     pincode = db.Column(db.String(10), nullable=True)
+
+    # Denormalized from OrderItem when the order is placed, so order lists never load items
+    item_count = db.Column(db.Integer, nullable=True)
+    items_summary = db.Column(db.String(500), nullable=True)
     
     items = db.relationship('OrderItem', backref='order', lazy=True, cascade="all, delete-orphan")
 
+    __table_args__ = (
+        db.Index('ix_order_manager_date_id', 'store_manager_id', 'order_date', 'id'), # Dashboard order pages
+        db.Index('ix_order_user_id', 'user_id'),
+    )
+
+def summarize_order_items(lines, max_length=500):
+    """'Dolo 650mg (x2), Crocin Advance (x1)' from (name, quantity) pairs, cut to fit Order.items_summary."""
+    parts = [f"{name} (x{quantity})" for name, quantity in lines]
+    summary = ', '.join(parts)
+    shown = len(parts)
+    while len(summary) > max_length and shown > 1:
+        shown -= 1
+        summary = ', '.join(parts[:shown]) + f", +{len(parts) - shown} more"
+    return summary[:max_length]
+
 class OrderItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False)
@@ -77,6 +125,22 @@ class OrderItem(db.Model):
     quantity = db.Column(db.Integer, nullable=False)
     price = db.Column(db.Float, nullable=False) # Snapshot of price at purchase
 
+    __table_args__ = (
+        db.Index('ix_order_item_order_id', 'order_id'),
+    )
+
+class CartItem(db.Model):
+    # Server-side cart (cart_utils.py): one row per customer and medicine, so the session cookie never carries the cart
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    medicine_id = db.Column(db.Integer, db.ForeignKey('medicine.id'), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    added_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'medicine_id', name='uq_cart_item_user_medicine'), # Target of the upsert
+    )
+
 class CustomerQuery(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True) # Nullable for guests
@@ -86,3 +150,49 @@ class CustomerQuery(db.Model):
     message = db.Column(db.Text, nullable=False)
     status = db.Column(db.String(20), default='New') # New, In Progress, Resolved
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class CacheVersion(db.Model):
+    # Shared version counters so every worker process can tell when its in-memory caches are stale
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class NearExpiryItem(db.Model):
+    # Materialized near-expiry/expired worklist per store, rebuilt by expiry_sweeper.sweep_expiry()
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True) # Store manager
+    medicine_id = db.Column(db.Integer, db.ForeignKey('medicine.id'), nullable=False)
+    medicine_name = db.Column(db.String(100), nullable=False)
+    expiry_date = db.Column(db.Date, nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False) # 'Expired' or 'Near Expiry'
+    refreshed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_near_expiry_item_user_expiry', 'user_id', 'expiry_date'),
+    )
+
+# --- Sales Rollups (maintained by analytics.py) ---
+# One row per store and day (and per medicine / category), incremented when an order is
+# placed and decremented when it is cancelled, so reports never scan order history.
+
+class StoreDailySales(db.Model):
+    store_manager_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    orders = db.Column(db.Integer, nullable=False, default=0)
+    units = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+class MedicineDailySales(db.Model):
+    store_manager_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    medicine_id = db.Column(db.Integer, primary_key=True) # No FK: history outlives deleted medicines
+    medicine_name = db.Column(db.String(100), nullable=False)
+    units = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+class CategoryDailySales(db.Model):
+    store_manager_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    category_id = db.Column(db.Integer, db.ForeignKey('category.id'), primary_key=True)
+    units = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
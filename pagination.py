@@ -0,0 +1,89 @@
+import base64
+import json
+from collections import namedtuple
+from datetime import date, datetime
+from sqlalchemy import tuple_
+
+# One page of rows plus the opaque cursor for the page after it (None on the last page)
+Page = namedtuple('Page', ['items', 'next_cursor'])
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+def page_size_arg(value, default=DEFAULT_PAGE_SIZE):
+    """Parses a ?per_page= value, clamped to 1..MAX_PAGE_SIZE."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+def encode_cursor(data):
+    return base64.urlsafe_b64encode(json.dumps(data, default=_to_json).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Returns the cursor payload, or None for a missing/garbled cursor (treated as page 1)."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+
+def _to_json(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'Cannot encode {type(value).__name__} in a cursor')
+
+def _from_json(column, value):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return value
+
+def paginate_keyset(query, columns, cursor, page_size, descending=False):
+    """Seek pagination: rows strictly after the cursor's (col1, col2, ...) values.
+
+    The last column must be unique (normally the primary key) so the order is total.
+    Cost is one index range scan of page_size + 1 rows, however deep the page.
+    """
+    data = decode_cursor(cursor)
+    after = data.get('after') if isinstance(data, dict) else None
+    values = None
+    if isinstance(after, list) and len(after) == len(columns):
+        try:
+            values = [_from_json(col, v) for col, v in zip(columns, after)]
+        except (TypeError, ValueError):
+            values = None # Tampered cursor: start from page 1
+    if values:
+        key = tuple_(*columns)
+        query = query.filter(key < tuple_(*values) if descending else key > tuple_(*values))
+
+    order = [col.desc() for col in columns] if descending else list(columns)
+    rows = query.order_by(*order).limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor({'after': [getattr(last, col.key) for col in columns]})
+    return Page(rows, next_cursor)
+
+def paginate_ranked(query, cursor, page_size, max_offset=1000):
+    """Offset pagination for relevance-ranked search results (rank is not a stable seek key).
+
+    Depth is capped at max_offset rows so a single request's work stays bounded.
+    """
+    data = decode_cursor(cursor)
+    offset = data.get('offset', 0) if isinstance(data, dict) else 0
+    offset = max(0, min(int(offset), max_offset)) if isinstance(offset, int) else 0
+
+    rows = query.offset(offset).limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size and offset + page_size < max_offset:
+        next_cursor = encode_cursor({'offset': offset + page_size})
+    return Page(rows[:page_size], next_cursor)
@@ -0,0 +1,130 @@
+import json
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from flask import g, request, jsonify, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# --- Request Performance Monitor (opt-in: PERF_MONITOR=1) ---
+# Counts SQL statements and database time per request through engine events, reports
+# them in Server-Timing / X-DB-* headers plus one JSON log line per request, flags
+# requests over the configured limits and keeps rolling per-endpoint stats for /__perf.
+
+SAMPLES_PER_ENDPOINT = 500
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values), max(1, math.ceil(pct / 100 * len(sorted_values)))) - 1
+    return sorted_values[index]
+
+
+class PerfStats:
+    """Rolling (duration_ms, queries, db_ms) samples per endpoint, shared by all threads."""
+
+    def __init__(self, size=SAMPLES_PER_ENDPOINT):
+        self.samples = defaultdict(lambda: deque(maxlen=size))
+        self.flagged = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def add(self, endpoint, duration_ms, queries, db_ms, flagged):
+        with self.lock:
+            self.samples[endpoint].append((duration_ms, queries, db_ms))
+            if flagged:
+                self.flagged[endpoint] += 1
+
+    def summary(self):
+        with self.lock:
+            snapshot = {endpoint: list(samples) for endpoint, samples in self.samples.items()}
+            flagged = dict(self.flagged)
+
+        endpoints = {}
+        for endpoint, samples in snapshot.items():
+            durations = sorted(s[0] for s in samples)
+            queries = sorted(s[1] for s in samples)
+            endpoints[endpoint] = {
+                'requests': len(samples),
+                'p50_ms': round(percentile(durations, 50), 2),
+                'p95_ms': round(percentile(durations, 95), 2),
+                'p50_queries': percentile(queries, 50),
+                'p95_queries': percentile(queries, 95),
+                'max_queries': queries[-1],
+                'avg_db_ms': round(sum(s[2] for s in samples) / len(samples), 2),
+                'flagged': flagged.get(endpoint, 0)
+            }
+        # Worst endpoints first
+        return dict(sorted(endpoints.items(), key=lambda item: item[1]['p95_ms'], reverse=True))
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'perf' in g:
+        conn.info.setdefault('perf_query_start', []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'perf' in g:
+        starts = conn.info.get('perf_query_start')
+        if not starts:
+            return
+        elapsed = (time.perf_counter() - starts.pop()) * 1000
+        perf = g.perf
+        perf['queries'] += 1
+        perf['db_ms'] += elapsed
+        if elapsed > perf['slowest_ms']:
+            perf['slowest_ms'] = elapsed
+            perf['slowest_sql'] = ' '.join(statement.split())[:200]
+
+
+def init_perf_monitor(app, slow_ms=500.0, max_queries=20, log=print):
+    """Instruments `app`; call once at startup, before the first request."""
+    stats = PerfStats()
+    app.extensions['perf_stats'] = stats
+
+    if not event.contains(Engine, 'before_cursor_execute', before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+
+    @app.before_request
+    def start_perf_timer():
+        g.perf = {'start': time.perf_counter(), 'queries': 0, 'db_ms': 0.0, 'slowest_ms': 0.0, 'slowest_sql': None}
+
+    @app.after_request
+    def report_perf(response):
+        perf = g.pop('perf', None)
+        if perf is None or request.endpoint == 'perf_summary':
+            return response
+
+        duration_ms = (time.perf_counter() - perf['start']) * 1000
+        flags = []
+        if duration_ms > slow_ms:
+            flags.append('slow')
+        if perf['queries'] > max_queries:
+            flags.append('many-queries')
+
+        response.headers['Server-Timing'] = (f'db;dur={perf["db_ms"]:.2f};desc="{perf["queries"]} queries", '
+                                             f'app;dur={duration_ms:.2f}')
+        response.headers['X-DB-Queries'] = str(perf['queries'])
+        response.headers['X-DB-Time-Ms'] = f'{perf["db_ms"]:.2f}'
+        if flags:
+            response.headers['X-Perf-Flags'] = ','.join(flags)
+
+        endpoint = request.endpoint or 'unmatched'
+        stats.add(endpoint, duration_ms, perf['queries'], perf['db_ms'], bool(flags))
+
+        record = {'perf': endpoint, 'method': request.method, 'path': request.path, 'status': response.status_code,
+                  'ms': round(duration_ms, 2), 'queries': perf['queries'], 'db_ms': round(perf['db_ms'], 2)}
+        if flags:
+            record.update(flags=flags, slowest_query_ms=round(perf['slowest_ms'], 2), slowest_query=perf['slowest_sql'])
+        log(json.dumps(record))
+        return response
+
+    @app.route('/__perf')
+    def perf_summary():
+        """Per-endpoint latency and query-count percentiles since startup (this process only)."""
+        return jsonify(thresholds={'slow_ms': slow_ms, 'max_queries': max_queries}, endpoints=stats.summary())
+
+    return stats
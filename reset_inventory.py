@@ -1,11 +1,19 @@
-from app import app, db, Medicine, User
+from sqlalchemy import select, delete
+from app import app, db, Medicine, User, CartItem, NearExpiryItem, StarterSeed
+from cache_utils import bump_version, CATALOG_VERSION
 
 def reset_inventory(username):
     with app.app_context():
         user = User.query.filter_by(username=username).first()
         if user:
-            # Delete all medicines for this user
-            Medicine.query.filter_by(user_id=user.id).delete()
+            # Delete all medicines for this user, after the rows that reference them
+            store_meds = select(Medicine.id).where(Medicine.user_id == user.id)
+            db.session.execute(delete(CartItem).where(CartItem.medicine_id.in_(store_meds)))
+            db.session.execute(delete(NearExpiryItem).where(NearExpiryItem.medicine_id.in_(store_meds)))
+            db.session.execute(delete(Medicine).where(Medicine.user_id == user.id))
+            # Forget the starter seed so the next login seeds the store again
+            db.session.execute(delete(StarterSeed).where(StarterSeed.user_id == user.id))
+            bump_version(CATALOG_VERSION)
             db.session.commit()
             print(f"Inventory cleared for {username}. Login again to re-seed.")
         else:
@@ -0,0 +1,126 @@
+import re
+from sqlalchemy import text, func, literal_column, Integer, Float
+from sqlalchemy.exc import OperationalError
+from models import db, Medicine
+
+# --- Medicine Search Backends ---
+# Each backend exposes install() (create index structures, idempotent) and
+# apply(query, search_query) (filter a Medicine query and order it by relevance).
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+def search_tokens(search_query):
+    return [t.lower() for t in TOKEN_RE.findall(search_query or '')]
+
+
+class LikeSearchBackend:
+    """Fallback: substring ILIKE over name/composition (full table scan)."""
+    name = 'like'
+
+    def install(self):
+        pass
+
+    def apply(self, query, search_query):
+        return query.filter(
+            db.or_(
+                Medicine.name.ilike(f'%{search_query}%'),
+                Medicine.composition.ilike(f'%{search_query}%')
+            )
+        )
+
+
+class SqliteFtsBackend:
+    """SQLite FTS5 external-content index over medicine(name, composition), synced by triggers."""
+    name = 'fts5'
+
+    DDL = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS medicine_fts USING fts5("
+        "name, composition, content='medicine', content_rowid='id')",
+        "CREATE TRIGGER IF NOT EXISTS medicine_fts_ai AFTER INSERT ON medicine BEGIN "
+        "INSERT INTO medicine_fts(rowid, name, composition) VALUES (new.id, new.name, new.composition); END",
+        "CREATE TRIGGER IF NOT EXISTS medicine_fts_ad AFTER DELETE ON medicine BEGIN "
+        "INSERT INTO medicine_fts(medicine_fts, rowid, name, composition) VALUES ('delete', old.id, old.name, old.composition); END",
+        "CREATE TRIGGER IF NOT EXISTS medicine_fts_au AFTER UPDATE OF name, composition ON medicine BEGIN "
+        "INSERT INTO medicine_fts(medicine_fts, rowid, name, composition) VALUES ('delete', old.id, old.name, old.composition); "
+        "INSERT INTO medicine_fts(rowid, name, composition) VALUES (new.id, new.name, new.composition); END",
+    ]
+
+    def __init__(self):
+        self.fallback = None
+
+    def install(self):
+        try:
+            with db.engine.begin() as conn:
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'medicine_fts'"
+                )).first()
+                for statement in self.DDL:
+                    conn.execute(text(statement))
+                if not exists:
+                    # Index rows that were written before the triggers existed
+                    conn.execute(text("INSERT INTO medicine_fts(medicine_fts) VALUES ('rebuild')"))
+        except OperationalError as e:
+            # SQLite built without FTS5
+            print(f"FTS5 unavailable, falling back to LIKE search: {e}")
+            self.fallback = LikeSearchBackend()
+
+    def apply(self, query, search_query):
+        tokens = search_tokens(search_query)
+        if self.fallback or not tokens:
+            return LikeSearchBackend().apply(query, search_query)
+
+        # Every token must match, as a prefix so results update while typing
+        match = ' '.join(f'"{t}"*' for t in tokens)
+        hits = text(
+            "SELECT rowid AS id, bm25(medicine_fts, 10.0, 1.0) AS score "
+            "FROM medicine_fts WHERE medicine_fts MATCH :match"
+        ).bindparams(match=match).columns(id=Integer, score=Float).subquery('fts_hits')
+        # bm25() is lower-is-better; name hits weigh 10x composition hits
+        return query.join(hits, Medicine.id == hits.c.id).order_by(hits.c.score, Medicine.id)
+
+
+class PostgresFtsBackend:
+    """Postgres tsvector expression with a GIN index; always in sync, no extra column."""
+    name = 'tsvector'
+
+    DOCUMENT_SQL = "to_tsvector('simple', coalesce(medicine.name, '') || ' ' || coalesce(medicine.composition, ''))"
+
+    def install(self):
+        with db.engine.begin() as conn:
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_medicine_search ON medicine USING GIN "
+                "((to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(composition, ''))))"
+            ))
+
+    def apply(self, query, search_query):
+        tokens = search_tokens(search_query)
+        if not tokens:
+            return LikeSearchBackend().apply(query, search_query)
+
+        document = literal_column(self.DOCUMENT_SQL)
+        ts_query = func.to_tsquery(literal_column("'simple'"), ' & '.join(f'{t}:*' for t in tokens))
+        return query.filter(document.op('@@')(ts_query)).order_by(
+            func.ts_rank(document, ts_query).desc(), Medicine.id
+        )
+
+
+_backends = {} # engine url -> installed backend
+
+def get_search_backend():
+    """Returns the installed search backend for the current engine, installing it on first use."""
+    key = str(db.engine.url)
+    if key not in _backends:
+        dialect = db.engine.dialect.name
+        if dialect == 'sqlite':
+            backend = SqliteFtsBackend()
+        elif dialect == 'postgresql':
+            backend = PostgresFtsBackend()
+        else:
+            backend = LikeSearchBackend()
+        backend.install()
+        _backends[key] = backend
+    return _backends[key]
+
+def apply_search(query, search_query):
+    """Filters a Medicine query by search text, ordered by relevance."""
+    return get_search_backend().apply(query, search_query)
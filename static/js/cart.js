@@ -0,0 +1,98 @@
+// Progressive enhancement for the catalog and cart pages: "Add to Cart" forms and cart
+// remove links talk to the JSON cart API instead of reloading the page. Without
+// JavaScript (or if the API call fails) the plain form/link still works as before.
+(function () {
+    const script = document.currentScript;
+    const addUrl = script.dataset.addUrl;
+    const itemUrl = script.dataset.itemUrl; // Ends in /0, replaced by the medicine id
+
+    function showMessage(text, category) {
+        let box = document.getElementById('cart-toast');
+        if (!box) {
+            box = document.createElement('div');
+            box.id = 'cart-toast';
+            box.style.cssText = 'position: fixed; top: 80px; right: 20px; z-index: 2000; min-width: 220px;';
+            document.body.appendChild(box);
+        }
+        box.className = 'alert alert-' + category;
+        box.textContent = text;
+        box.hidden = false;
+        clearTimeout(box.hideTimer);
+        box.hideTimer = setTimeout(function () { box.hidden = true; }, 2500);
+    }
+
+    function updateTotals(cart) {
+        document.querySelectorAll('[data-cart-count]').forEach(function (badge) {
+            badge.textContent = cart.count;
+            badge.hidden = cart.count === 0;
+        });
+        document.querySelectorAll('[data-cart-total]').forEach(function (total) {
+            total.textContent = '₹' + cart.total_amount;
+        });
+    }
+
+    // Resolves with the new cart totals, or null when the user is being sent to the login page
+    function send(method, url, body) {
+        return fetch(url, {
+            method: method,
+            headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+            body: body ? JSON.stringify(body) : undefined,
+            credentials: 'same-origin'
+        }).then(function (response) {
+            return response.json().then(function (data) {
+                if (response.status === 401 && data.login_url) {
+                    window.location = data.login_url;
+                    return null; // Already navigating; the fallback must not start a second one
+                }
+                if (!response.ok) {
+                    throw new Error(data.error || 'Request failed');
+                }
+                return data;
+            });
+        });
+    }
+
+    document.addEventListener('submit', function (event) {
+        const form = event.target;
+        // Only "Add to Cart"; "Buy Now" keeps its normal submit straight to checkout
+        if (!form.dataset.medicineId || (event.submitter && event.submitter.value === 'buy_now')) {
+            return;
+        }
+        event.preventDefault();
+        const quantity = form.querySelector('[name="quantity"]');
+        send('POST', addUrl, { medicine_id: Number(form.dataset.medicineId), quantity: Number(quantity ? quantity.value : 1) })
+            .then(function (cart) {
+                if (!cart) {
+                    return;
+                }
+                updateTotals(cart);
+                showMessage(cart.message, 'success');
+            })
+            .catch(function () { form.submit(); }); // Fall back to the full-page flow
+    });
+
+    document.addEventListener('click', function (event) {
+        const link = event.target.closest('[data-cart-remove]');
+        if (!link) {
+            return;
+        }
+        event.preventDefault();
+        send('DELETE', itemUrl.replace(/0$/, link.dataset.cartRemove))
+            .then(function (cart) {
+                if (!cart) {
+                    return;
+                }
+                const row = link.closest('.cart-item');
+                if (row) {
+                    row.remove();
+                }
+                updateTotals(cart);
+                if (cart.lines === 0) {
+                    window.location.reload(); // Show the empty-cart page
+                } else {
+                    showMessage(cart.message, 'success');
+                }
+            })
+            .catch(function () { window.location = link.href; });
+    });
+})();
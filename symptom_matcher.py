@@ -0,0 +1,58 @@
+from collections import deque
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over grouped keywords.
+
+    match(text) scans the text once and returns the set of groups that have at
+    least one keyword occurring anywhere in it (overlapping occurrences included),
+    i.e. the same answer as `any(k in text for k in keywords)` for every group.
+    """
+
+    def __init__(self, groups):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [set()]
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                self._add(keyword.lower(), group)
+        self._build()
+
+    def _add(self, keyword, group):
+        node = 0
+        for ch in keyword:
+            child = self.goto[node].get(ch)
+            if child is None:
+                child = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(set())
+                self.goto[node][ch] = child
+            node = child
+        self.out[node].add(group)
+
+    def _build(self):
+        # Breadth-first so every fail target is finished before its dependants
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                self.out[child] |= self.out[self.fail[child]]
+        self.out = [frozenset(groups) for groups in self.out]
+
+    def match(self, text):
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        found = set()
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
@@ -0,0 +1,55 @@
+import random
+from app import HEALTH_KB, SYMPTOM_MATCHER, smart_symptom_match
+from symptom_matcher import KeywordMatcher
+
+def linear_scan_groups(query):
+    """Reference answer: the original one-`any()`-per-list substring scans."""
+    heart = HEALTH_KB['heart_safe_mode']
+    groups = set()
+    for name, keywords in [('heart', heart['keywords']), ('heart_acidity', heart['acidity_keywords']),
+                           ('heart_ors', heart['ors_keywords']), ('heart_severe', heart['severe_keywords']),
+                           ('level_2', HEALTH_KB['level_2_chronic_sensitive']['keywords'])]:
+        if any(k in query for k in keywords):
+            groups.add(name)
+    for idx, data in enumerate(HEALTH_KB['level_1_acute']):
+        if any(k in query for k in data['keywords']):
+            groups.add(('level_1', idx))
+    return groups
+
+def test_symptom_matcher():
+    print("--- Symptom Matcher Equivalence ---")
+
+    # Overlapping keywords must all be reported
+    matcher = KeywordMatcher({'a': ['he', 'hers'], 'b': ['she'], 'c': ['his'], 'd': ['xyz']})
+    if matcher.match('ushers') == {'a', 'b'}:
+        print("PASS: Overlapping keywords found in one pass.")
+    else:
+        print(f"FAIL: Overlap handling returned {matcher.match('ushers')}")
+
+    all_keywords = [k for data in HEALTH_KB['level_1_acute'] for k in data['keywords']]
+    all_keywords += HEALTH_KB['level_2_chronic_sensitive']['keywords']
+    all_keywords += HEALTH_KB['heart_safe_mode']['keywords'] + HEALTH_KB['heart_safe_mode']['severe_keywords']
+
+    rng = random.Random(42)
+    filler = ['i have', 'since yesterday', 'and', 'mild', 'bad', 'with', 'xyz', 'at night']
+    queries = list(all_keywords)
+    for _ in range(2000):
+        words = rng.sample(all_keywords, rng.randint(1, 4)) + rng.sample(filler, rng.randint(0, 3))
+        rng.shuffle(words)
+        queries.append(' '.join(words))
+
+    mismatches = [q for q in queries if SYMPTOM_MATCHER.match(q) != linear_scan_groups(q)]
+    if not mismatches:
+        print(f"PASS: Matcher agrees with linear scans on {len(queries)} queries.")
+    else:
+        print(f"FAIL: {len(mismatches)} mismatches, e.g. '{mismatches[0]}'")
+
+    results = smart_symptom_match('  Chest Pain with BURNING and weakness ')
+    meds = results[0]['medicines'] if results else []
+    if len(results) == 1 and any('Digene' in m for m in meds) and any('ORS' in m for m in meds):
+        print("PASS: Heart safe mode conditional meds intact.")
+    else:
+        print(f"FAIL: Heart safe mode returned {results}")
+
+if __name__ == "__main__":
+    test_symptom_matcher()
@@ -1,6 +1,7 @@
 from app import app, db
 from models import Medicine
 from medicines_data import REAL_MEDICINES_DB
+from cache_utils import bump_version, CATALOG_VERSION
 
 def update_compositions():
     with app.app_context():
@@ -13,6 +14,7 @@ def update_compositions():
                     if not med.composition:
                         med.composition = item['comp']
                         print(f"Updated {med.name} with composition: {item['comp']}")
+        bump_version(CATALOG_VERSION)
         db.session.commit()
         print("Update complete.")
 
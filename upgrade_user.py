@@ -1,10 +1,11 @@
-from app import app, db, User
+from app import app, db, User, user_cache
 
 def upgrade_user(username):
     with app.app_context():
         user = User.query.filter_by(username=username).first()
         if user:
             user.role = 'store_manager'
+            user_cache.invalidate(user.id) # Running workers drop their cached copy
             db.session.commit()
             print(f"User {username} upgraded to store_manager.")
         else:
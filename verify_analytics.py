@@ -0,0 +1,120 @@
+import time
+from datetime import date, timedelta
+from sqlalchemy import select
+from app import app, db, User, Medicine, Category, Order, OrderItem
+from models import StoreDailySales, MedicineDailySales, CategoryDailySales
+from analytics import sales_report, backfill_sales_rollups
+from werkzeug.security import generate_password_hash
+
+ADDRESS = {
+    'payment_method': 'COD', 'full_name': 'Analytics Tester', 'mobile_number': '1234567890',
+    'address_line1': '1 Street', 'area_landmark': 'Landmark', 'city': 'City', 'state': 'State', 'pincode': '123456'
+}
+
+def login(client, user_id):
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user_id)
+        sess['_fresh'] = True
+
+def snapshot(manager_id):
+    report = sales_report(manager_id, 30)
+    return (report['orders'], report['units'], report['revenue'],
+            [(t['medicine_id'], t['units']) for t in report['top_sellers']],
+            [(c['category_id'], c['units']) for c in report['categories']])
+
+def other_store_rollups(manager_id):
+    return db.session.execute(select(StoreDailySales.store_manager_id, StoreDailySales.day, StoreDailySales.revenue)
+                              .where(StoreDailySales.store_manager_id != manager_id)
+                              .order_by(StoreDailySales.store_manager_id, StoreDailySales.day)).all()
+
+def verify_analytics():
+    client = app.test_client()
+    with app.app_context():
+        print("--- Sales Analytics Verification ---")
+        # Orders go to a throwaway store; only its rollups are rebuilt and compared
+        manager = User.query.filter_by(username='analytics_probe_store').first()
+        if not manager:
+            manager = User(username='analytics_probe_store', password_hash=generate_password_hash('pass'), role='store_manager')
+            db.session.add(manager)
+            db.session.commit()
+        manager_id = manager.id
+        category_id = db.session.scalar(select(Category.id).order_by(Category.id).limit(1))
+        meds = [Medicine(name=f'Analytics Probe {i}', price=20 + i, quantity=50, category_id=category_id,
+                         expiry_date=date.today() + timedelta(days=365), user_id=manager_id) for i in range(2)]
+        db.session.add_all(meds)
+        customer = User(username='analytics_tester', password_hash=generate_password_hash('pass'), role='customer')
+        db.session.add(customer)
+        db.session.commit()
+        customer_id = customer.id
+        others = other_store_rollups(manager_id)
+        backfill_sales_rollups(store_ids=[manager_id])
+        before = sales_report(manager_id, 30)
+        cart = {meds[0].id: 3, meds[1].id: 1}
+        expected_revenue = round(meds[0].price * 3 + meds[1].price, 2)
+
+    login(client, customer_id)
+    for _ in range(2):
+        for med_id, qty in cart.items():
+            client.post(f'/add_to_cart/{med_id}', data={'quantity': qty})
+        client.post('/place_order', data=ADDRESS)
+
+    login(client, manager_id)
+    report = client.get('/api/analytics?days=30').get_json()
+    if (report['orders'] - before['orders'] == 2 and report['units'] - before['units'] == 8
+            and round(report['revenue'] - before['revenue'], 2) == round(2 * expected_revenue, 2)):
+        print(f"PASS: place_order updated the rollups (revenue {report['revenue']}).")
+    else:
+        print(f"FAIL: Report after orders {report}")
+
+    with app.app_context():
+        order_ids = [o.id for o in Order.query.filter_by(user_id=customer_id).order_by(Order.id)]
+    for _ in range(2): # Cancelling twice must only subtract once
+        client.post(f'/update_order_status/{order_ids[0]}', data={'status': 'Cancelled'})
+    report = client.get('/api/analytics?days=30').get_json()
+    if report['orders'] - before['orders'] == 1 and report['units'] - before['units'] == 4:
+        print("PASS: Cancellation subtracts the order exactly once.")
+    else:
+        print(f"FAIL: After cancel {report['orders']} orders, {report['units']} units")
+
+    client.post(f'/update_order_status/{order_ids[0]}', data={'status': 'Packed'})
+    client.post(f'/update_order_status/{order_ids[1]}', data={'status': 'Delivered'})
+    with app.app_context():
+        incremental = snapshot(manager_id)
+        backfill_sales_rollups(store_ids=[manager_id])
+        rebuilt = snapshot(manager_id)
+        untouched = other_store_rollups(manager_id) == others
+    if incremental == rebuilt:
+        print("PASS: Incremental rollups match a full backfill.")
+    else:
+        print(f"FAIL: Incremental {incremental} vs backfill {rebuilt}")
+    if untouched:
+        print("PASS: A backfill scoped to one store leaves other stores' rollups alone.")
+    else:
+        print("FAIL: Scoped backfill changed another store's rollups.")
+
+    start = time.perf_counter()
+    for days in (30, 90, 365):
+        client.get(f'/api/analytics?days={days}')
+    elapsed = (time.perf_counter() - start) / 3
+    if client.get('/api/analytics?days=7').status_code == 400:
+        print(f"PASS: Windows answered in {elapsed * 1000:.1f} ms per request; unsupported windows rejected.")
+    else:
+        print("FAIL: Unsupported window accepted.")
+
+    login(client, customer_id)
+    if client.get('/api/analytics').status_code == 403:
+        print("PASS: Customers cannot read store analytics.")
+    else:
+        print("FAIL: Customer read analytics.")
+
+    with app.app_context():
+        OrderItem.query.filter(OrderItem.order_id.in_(order_ids)).delete()
+        Order.query.filter(Order.id.in_(order_ids)).delete()
+        for model in (StoreDailySales, MedicineDailySales, CategoryDailySales):
+            model.query.filter_by(store_manager_id=manager_id).delete()
+        Medicine.query.filter_by(user_id=manager_id).delete()
+        User.query.filter(User.id.in_([customer_id, manager_id])).delete()
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_analytics()
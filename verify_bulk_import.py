@@ -0,0 +1,71 @@
+import io
+from app import app, db, User, Medicine
+from datetime import date, timedelta
+
+CSV_ROWS = """name,category,price,quantity,expiry_date,medicine_type,unit,image_url,composition
+Import Probe A,Must Haves,12.5,40,{safe},Tablet,Strip,,Probe 500 mg
+Import Probe B,must haves,3,10,{past},Syrup,Bottle,,
+Import Probe C,No Such Category,1,1,{safe},,,,
+Import Probe D,Must Haves,abc,1,{safe},,,,
+Import Probe E,Must Haves,1,1,31-12-2030,,,,
+"""
+
+def verify_bulk_import():
+    client = app.test_client()
+    safe = (date.today() + timedelta(days=365)).isoformat()
+    past = (date.today() - timedelta(days=1)).isoformat()
+
+    with app.app_context():
+        print("--- Bulk Import Verification ---")
+        manager_id = User.query.filter_by(username='virat').first().id
+
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(manager_id)
+        sess['_fresh'] = True
+
+    data = {'file': (io.BytesIO(CSV_ROWS.format(safe=safe, past=past).encode()), 'stock.csv')}
+    response = client.post('/import_medicines', data=data, content_type='multipart/form-data', follow_redirects=True)
+    body = response.get_data(as_text=True)
+    if 'Imported 2 new and 0 updated' in body and 'Skipped 3 invalid rows' in body and 'line 4' in body:
+        print("PASS: CSV upload imported valid rows and reported bad ones by line.")
+    else:
+        print(f"FAIL: Unexpected import summary (status {response.status_code}).")
+
+    jsonl = (f'{{"name": "Import Probe A", "category": "Must Haves", "price": 15, "quantity": 5, "expiry_date": "{safe}"}}\n'
+             'not json\n')
+    data = {'file': (io.BytesIO(jsonl.encode()), 'restock.jsonl')}
+    response = client.post('/import_medicines', data=data, content_type='multipart/form-data', follow_redirects=True)
+    if 'Imported 0 new and 1 updated' in response.get_data(as_text=True):
+        print("PASS: JSON Lines upload upserted an existing medicine.")
+    else:
+        print("FAIL: JSON Lines upsert not reported.")
+
+    with app.app_context():
+        probes = {m.name: m for m in Medicine.query.filter(Medicine.name.like('Import Probe%'), Medicine.user_id == manager_id)}
+        a, b = probes.get('Import Probe A'), probes.get('Import Probe B')
+        if len(probes) == 2 and a.price == 15 and a.quantity == 5 and b.availability is False:
+            print("PASS: Stored values, upsert and availability are correct.")
+        else:
+            print(f"FAIL: Stored rows {[(m.name, m.price, m.quantity, m.availability) for m in probes.values()]}")
+
+    response = client.get('/medicines?search=import probe')
+    if b'Import Probe A' in response.data:
+        print("PASS: Imported medicines are searchable right away.")
+    else:
+        print("FAIL: Imported medicine missing from search.")
+
+    runner = app.test_cli_runner()
+    with open('/tmp/import_probe.csv', 'w') as f:
+        f.write(CSV_ROWS.format(safe=safe, past=past))
+    result = runner.invoke(args=['import-medicines', '/tmp/import_probe.csv', '--store', 'virat', '--batch-size', '2'])
+    if result.exit_code == 0 and 'Imported 0 new and 2 updated' in result.output:
+        print("PASS: CLI import works in small batches.")
+    else:
+        print(f"FAIL: CLI returned {result.exit_code}: {result.output}")
+
+    with app.app_context():
+        Medicine.query.filter(Medicine.name.like('Import Probe%'), Medicine.user_id == manager_id).delete()
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_bulk_import()
@@ -0,0 +1,100 @@
+import re
+from sqlalchemy import event
+from app import app, db, User, Medicine
+from cart_utils import clear_cart
+from werkzeug.security import generate_password_hash
+
+def verify_cart_api():
+    print("--- Cart JSON API Verification ---")
+    with app.app_context():
+        meds = Medicine.query.filter(Medicine.quantity > 0, Medicine.availability == True).order_by(Medicine.id).limit(2).all()
+        if len(meds) < 2:
+            print("SKIP: Need at least two medicines in stock.")
+            return
+        customer = User.query.filter_by(username='cart_api_tester').first()
+        if not customer:
+            customer = User(username='cart_api_tester', password_hash=generate_password_hash('pass'), role='customer')
+            db.session.add(customer)
+            db.session.commit()
+        clear_cart(customer.id)
+        db.session.commit()
+        customer_id = customer.id
+        (a_id, a_price), (b_id, b_price) = [(m.id, m.price) for m in meds]
+
+    client = app.test_client()
+    response = client.post('/api/cart/items', json={'medicine_id': a_id})
+    if response.status_code == 401 and response.get_json().get('login_url'):
+        print("PASS: Guests get 401 JSON with the login URL.")
+    else:
+        print(f"FAIL: Guest add returned {response.status_code}")
+
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(customer_id)
+        sess['_fresh'] = True
+    client.get('/api/cart') # Warm the user cache so the count below is the steady state
+
+    statements = []
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count)
+    response = client.post('/api/cart/items', json={'medicine_id': a_id, 'quantity': 2})
+    with app.app_context():
+        event.remove(db.engine, 'before_cursor_execute', count)
+    cart = response.get_json()
+    catalog_queries = [s for s in statements if 'FROM category' in s or 'medicine_fts' in s]
+    if response.status_code == 200 and cart['count'] == 2 and cart['lines'] == 1 and not catalog_queries:
+        print(f"PASS: Add returns the new totals in {len(statements)} queries and {len(response.data)} bytes.")
+    else:
+        print(f"FAIL: status={response.status_code}, cart={cart}, queries={statements}")
+
+    cart = client.post('/api/cart/items', data={'medicine_id': b_id, 'quantity': '3'}).get_json()
+    expected = round(a_price * 2 + b_price * 3, 2)
+    if cart['count'] == 5 and cart['lines'] == 2 and abs(cart['total_amount'] - expected) < 0.01:
+        print(f"PASS: Form-encoded add works and totals are ₹{cart['total_amount']}.")
+    else:
+        print(f"FAIL: cart={cart}, expected total {expected}")
+
+    bad = [client.post('/api/cart/items', json={'medicine_id': a_id, 'quantity': 0}).status_code,
+           client.post('/api/cart/items', json={'medicine_id': 'x'}).status_code,
+           client.post('/api/cart/items', json={'medicine_id': 999999999}).status_code,
+           client.patch(f'/api/cart/items/{a_id}', json={'quantity': -1}).status_code,
+           client.patch('/api/cart/items/999999999', json={'quantity': 1}).status_code]
+    if bad == [400, 400, 404, 400, 404]:
+        print("PASS: Invalid quantities, ids and missing lines are rejected.")
+    else:
+        print(f"FAIL: Status codes {bad}")
+
+    cart = client.patch(f'/api/cart/items/{a_id}', json={'quantity': 7}).get_json()
+    removed = client.patch(f'/api/cart/items/{b_id}', json={'quantity': 0}).get_json()
+    if cart['count'] == 10 and removed['count'] == 7 and removed['lines'] == 1:
+        print("PASS: PATCH sets the quantity and 0 removes the line.")
+    else:
+        print(f"FAIL: after set={cart}, after zero={removed}")
+
+    badge = re.search(r'data-cart-count\s*>(\d+)<', client.get('/cart').get_data(as_text=True))
+    guest_badge = re.search(r'data-cart-count\s+hidden', app.test_client().get('/medicines').get_data(as_text=True))
+    if badge and badge.group(1) == '7' and guest_badge:
+        print("PASS: The nav badge is filled on page load (hidden for guests).")
+    else:
+        print(f"FAIL: badge={badge and badge.group(0)}, guest badge hidden={bool(guest_badge)}")
+
+    cart = client.delete(f'/api/cart/items/{a_id}').get_json()
+    if cart['count'] == 0 and cart['lines'] == 0 and cart['total_amount'] == 0:
+        print("PASS: DELETE empties the line.")
+    else:
+        print(f"FAIL: cart after delete={cart}")
+
+    page = client.get('/medicines').get_data(as_text=True)
+    if 'data-medicine-id=' in page and 'js/cart.js' in page and 'data-cart-count' in page:
+        print("PASS: Catalog forms are wired to cart.js (plain POST still works without it).")
+    else:
+        print("FAIL: Catalog page is missing the cart.js hooks.")
+
+    with app.app_context():
+        clear_cart(customer_id)
+        db.session.delete(db.session.get(User, customer_id))
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_cart_api()
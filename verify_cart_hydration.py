@@ -0,0 +1,52 @@
+from app import app, db, Medicine
+from cart_utils import hydrate_cart
+from sqlalchemy import event
+
+def verify_cart_hydration():
+    with app.app_context():
+        print("--- Cart Hydration Verification ---")
+
+        meds = Medicine.query.limit(30).all()
+        if not meds:
+            print("SKIP: No medicines found to test with.")
+            return
+
+        cart_session = {str(m.id): 2 for m in meds}
+        cart_session['999999'] = 1 # Deleted medicine should be skipped
+
+        statements = []
+        def count_query(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        db.session.expunge_all()
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+        try:
+            cart_view = hydrate_cart(cart_session)
+            for item in cart_view.items:
+                item.medicine.category.name # Must not trigger a lazy load
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_query)
+
+        if len(statements) == 1:
+            print(f"PASS: {len(meds)} cart lines hydrated with 1 query.")
+        else:
+            print(f"FAIL: Expected 1 query, got {len(statements)}.")
+
+        if len(cart_view.items) == len(meds):
+            print("PASS: Unknown medicine ids are skipped.")
+        else:
+            print(f"FAIL: Expected {len(meds)} lines, got {len(cart_view.items)}.")
+
+        expected_total = sum(m.price * 2 for m in meds)
+        if abs(cart_view.total_amount - expected_total) < 0.01:
+            print(f"PASS: Cart total matches (₹{cart_view.total_amount:.2f}).")
+        else:
+            print(f"FAIL: Cart total {cart_view.total_amount} != {expected_total}")
+
+        if [str(i.medicine.id) for i in cart_view.items] == list(cart_session.keys())[:-1]:
+            print("PASS: Cart order preserved.")
+        else:
+            print("FAIL: Cart order changed.")
+
+if __name__ == "__main__":
+    verify_cart_hydration()
@@ -0,0 +1,154 @@
+from app import app, db, User, Medicine, Order, CartItem
+from models import StoreDailySales, MedicineDailySales, CategoryDailySales
+from cart_utils import cart_quantities, clear_cart
+from analytics import record_order_sales, order_lines
+from maintenance import dedupe_medicines
+from werkzeug.security import generate_password_hash
+
+ADDRESS = {
+    'payment_method': 'COD', 'full_name': 'Cart Tester', 'mobile_number': '1234567890',
+    'address_line1': '1 Street', 'area_landmark': 'Landmark', 'city': 'City', 'state': 'State', 'pincode': '123456'
+}
+
+def login(client, user_id):
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user_id)
+        sess['_fresh'] = True
+
+def verify_cart_store():
+    print("--- Server-Side Cart Verification ---")
+    with app.app_context():
+        meds = Medicine.query.filter(Medicine.quantity > 10, Medicine.availability == True).order_by(Medicine.id).limit(3).all()
+        if len(meds) < 3:
+            print("SKIP: Need at least three medicines in stock.")
+            return
+        customer = User.query.filter_by(username='cart_tester').first()
+        if not customer:
+            customer = User(username='cart_tester', password_hash=generate_password_hash('pass'), role='customer')
+            db.session.add(customer)
+            db.session.commit()
+        clear_cart(customer.id)
+        db.session.commit()
+        customer_id, med_ids = customer.id, [m.id for m in meds]
+
+    client = app.test_client()
+    login(client, customer_id)
+    client.post(f'/add_to_cart/{med_ids[0]}', data={'quantity': 2})
+    client.post(f'/add_to_cart/{med_ids[0]}', data={'quantity': 3})
+    client.post(f'/add_to_cart/{med_ids[1]}', data={'quantity': 1})
+
+    with app.app_context():
+        lines = cart_quantities(customer_id)
+        if lines == {med_ids[0]: 5, med_ids[1]: 1}:
+            print("PASS: Repeated adds increment one CartItem row per medicine.")
+        else:
+            print(f"FAIL: Cart rows are {lines}")
+
+    with client.session_transaction() as sess:
+        if 'cart' not in sess:
+            print("PASS: The session cookie no longer carries the cart.")
+        else:
+            print(f"FAIL: Session still has a cart: {sess['cart']}")
+
+    page = client.get('/cart').get_data(as_text=True)
+    with app.app_context():
+        names = [db.session.get(Medicine, mid).name for mid in med_ids[:2]]
+    if all(name in page for name in names):
+        print("PASS: /cart renders the stored cart.")
+    else:
+        print("FAIL: /cart is missing stored items.")
+
+    client.post(f'/add_to_cart/{med_ids[1]}', data={'quantity': 0})
+    client.post(f'/add_to_cart/{med_ids[1]}', data={'quantity': '-3'})
+    client.post(f'/add_to_cart/{med_ids[1]}', data={'quantity': 'x'})
+    with app.app_context():
+        lines = cart_quantities(customer_id)
+    if lines == {med_ids[0]: 5, med_ids[1]: 1}:
+        print("PASS: Zero, negative and non-numeric quantities are rejected.")
+    else:
+        print(f"FAIL: Cart rows after bad quantities are {lines}")
+
+    if client.post('/add_to_cart/999999999', data={'quantity': 1}).status_code == 404:
+        print("PASS: Unknown medicines are not added.")
+    else:
+        print("FAIL: Unknown medicine id was accepted.")
+
+    client.get(f'/remove_from_cart/{med_ids[1]}')
+    # A cart left in the cookie by an older deploy is moved into the table on the next request
+    with client.session_transaction() as sess:
+        # Ids deleted since the cart was saved, or not ids at all, are dropped
+        sess['cart'] = {str(med_ids[0]): 1, str(med_ids[2]): 2, '999999999': 1, 'abc': 1}
+    client.get('/cart')
+    with app.app_context():
+        lines = cart_quantities(customer_id)
+    with client.session_transaction() as sess:
+        adopted = 'cart' not in sess
+    if lines == {med_ids[0]: 6, med_ids[2]: 2} and adopted:
+        print("PASS: Remove deletes the line and a legacy session cart is merged once, minus stale ids.")
+    else:
+        print(f"FAIL: Cart rows are {lines}, session cart dropped={adopted}")
+
+    # Duplicates in a probe store: dedupe must move the cart lines to the kept copy
+    with app.app_context():
+        store = User.query.filter_by(username='cart_probe_store').first()
+        if not store:
+            store = User(username='cart_probe_store', password_hash=generate_password_hash('pass'), role='store_manager')
+            db.session.add(store)
+            db.session.commit()
+        original = db.session.get(Medicine, med_ids[2])
+        twins = [Medicine(name='Cart Probe Twin', price=1, quantity=10, category_id=original.category_id,
+                          expiry_date=original.expiry_date, user_id=store.id) for _ in range(2)]
+        db.session.add_all(twins)
+        db.session.commit()
+        db.session.add_all([CartItem(user_id=customer_id, medicine_id=twins[0].id, quantity=2),
+                            CartItem(user_id=customer_id, medicine_id=twins[1].id, quantity=4)])
+        db.session.commit()
+        store_id = store.id
+        dedupe_medicines(user_ids=[store_id]) # Only the probe store, never real inventory
+        db.session.expire_all()
+        kept = Medicine.query.filter_by(user_id=store_id).one()
+        lines = cart_quantities(customer_id)
+        if lines.get(kept.id) == 6 and len(lines) == 3:
+            print("PASS: Dedupe merges cart lines onto the kept medicine.")
+        else:
+            print(f"FAIL: Cart rows after dedupe are {lines} (kept id {kept.id})")
+
+    client.post('/place_order', data=ADDRESS)
+    with app.app_context():
+        orders = Order.query.filter_by(user_id=customer_id).all()
+        if orders and not cart_quantities(customer_id):
+            print("PASS: Placing the order empties the stored cart.")
+        else:
+            print(f"FAIL: orders={len(orders)}, cart={cart_quantities(customer_id)}")
+
+        # A line whose medicine no longer exists (stored before foreign keys were enforced)
+        db.session.add(CartItem(user_id=customer_id, medicine_id=999999999, quantity=1))
+        db.session.commit()
+    checkout = client.get('/checkout')
+    placed = client.post('/place_order', data=ADDRESS)
+    with app.app_context():
+        ghost_orders = Order.query.filter_by(user_id=customer_id).count() - len(orders)
+        if checkout.status_code == 302 and placed.status_code == 302 and ghost_orders == 0:
+            print("PASS: A cart with only missing medicines is treated as empty at checkout.")
+        else:
+            print(f"FAIL: checkout={checkout.status_code}, place_order={placed.status_code}, new orders={ghost_orders}")
+        orders = Order.query.filter_by(user_id=customer_id).all()
+
+        # Cleanup: take the orders back out of the sales rollups and restore their stock
+        for order in orders:
+            if order.status != 'Cancelled':
+                record_order_sales(order, order_lines(order.id), sign=-1)
+            for item in order.items:
+                med = db.session.get(Medicine, item.medicine_id)
+                if med:
+                    med.quantity += item.quantity
+            db.session.delete(order)
+        clear_cart(customer_id)
+        for model in (StoreDailySales, MedicineDailySales, CategoryDailySales):
+            model.query.filter_by(store_manager_id=store_id).delete()
+        Medicine.query.filter_by(user_id=store_id).delete()
+        User.query.filter(User.id.in_([customer_id, store_id])).delete()
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_cart_store()
@@ -0,0 +1,121 @@
+from sqlalchemy import event
+from app import app, db, User, Medicine, Order, catalog_version
+from cache_utils import get_version, CATALOG_VERSION
+from cart_utils import add_cart_item, clear_cart
+from analytics import record_order_sales, order_lines
+from werkzeug.security import generate_password_hash
+
+ADDRESS = {
+    'payment_method': 'COD', 'full_name': 'ETag Tester', 'mobile_number': '1234567890',
+    'address_line1': '1 Street', 'area_landmark': 'Landmark', 'city': 'City', 'state': 'State', 'pincode': '123456'
+}
+
+def login(client, user_id):
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user_id)
+        sess['_fresh'] = True
+
+def counting_get(client, url, **kwargs):
+    statements = []
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        return client.get(url, **kwargs), statements
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'before_cursor_execute', count)
+
+def verify_catalog_etag():
+    print("--- Catalog ETag Verification ---")
+    catalog_version.ttl = 60 # Deterministic for this script: only local bumps refresh the version
+    with app.app_context():
+        med = Medicine.query.filter(Medicine.quantity > 20, Medicine.availability == True).order_by(Medicine.id).first()
+        if not med:
+            print("SKIP: Need a medicine in stock.")
+            return
+        manager = db.session.get(User, med.user_id)
+        customer = User.query.filter_by(username='etag_tester').first()
+        if not customer:
+            customer = User(username='etag_tester', password_hash=generate_password_hash('pass'), role='customer')
+            db.session.add(customer)
+            db.session.commit()
+        med_id, manager_id, customer_id = med.id, manager.id, customer.id
+        original_qty, original_price = med.quantity, med.price
+
+    guest = app.test_client()
+    first = guest.get('/medicines')
+    etag = first.headers.get('ETag')
+    if first.status_code == 200 and etag and 'no-cache' in first.headers.get('Cache-Control', ''):
+        print(f"PASS: Anonymous catalog page has ETag {etag}.")
+    else:
+        print(f"FAIL: status={first.status_code}, headers={dict(first.headers)}")
+        return
+
+    repeat, statements = counting_get(guest, '/medicines', headers={'If-None-Match': etag})
+    if repeat.status_code == 304 and not repeat.data and not statements:
+        print("PASS: If-None-Match answered 304 with no SQL and no rendering.")
+    else:
+        print(f"FAIL: status={repeat.status_code}, {len(repeat.data)} bytes, queries={statements}")
+
+    other = guest.get('/medicines?search=dolo').headers.get('ETag')
+    healthcare = guest.get('/healthcare').headers.get('ETag')
+    if other and healthcare and len({etag, other, healthcare}) == 3:
+        print("PASS: Each URL gets its own ETag.")
+    else:
+        print(f"FAIL: ETags {etag}, {other}, {healthcare}")
+
+    manager_client = app.test_client()
+    login(manager_client, manager_id)
+    manager_client.post(f'/update_medicine/{med_id}', data={'quantity': original_qty, 'price': 1.0})
+    changed = guest.get('/medicines', headers={'If-None-Match': etag})
+    if changed.status_code == 200 and changed.headers.get('ETag') != etag:
+        print("PASS: update_medicine bumps the catalog version; the old ETag gets a fresh page.")
+    else:
+        print(f"FAIL: status={changed.status_code} after update_medicine")
+
+    customer_client = app.test_client()
+    login(customer_client, customer_id)
+    page = customer_client.get('/medicines')
+    guest.post(f'/add_to_cart/{med_id}', data={'quantity': 1}) # Guests get a "please login" flash
+    flashed = guest.get('/medicines')
+    if 'ETag' not in page.headers and 'ETag' not in flashed.headers:
+        print("PASS: Logged-in pages and pages with pending flash messages are not cached.")
+    else:
+        print("FAIL: A personalised page carried an ETag.")
+
+    # Checkout only bumps the version when stock enters the "Only N left!" range
+    with app.app_context():
+        before = get_version(CATALOG_VERSION)
+        add_cart_item(customer_id, med_id, 1)
+        db.session.commit()
+    customer_client.post('/place_order', data=ADDRESS)
+    with app.app_context():
+        unchanged = get_version(CATALOG_VERSION) == before
+        db.session.get(Medicine, med_id).quantity = 11
+        db.session.commit()
+        add_cart_item(customer_id, med_id, 1)
+        db.session.commit()
+    customer_client.post('/place_order', data=ADDRESS)
+    with app.app_context():
+        bumped = get_version(CATALOG_VERSION) > before
+    if unchanged and bumped:
+        print("PASS: place_order bumps the version only when a card's stock display changes.")
+    else:
+        print(f"FAIL: unchanged={unchanged}, bumped={bumped}")
+
+    with app.app_context():
+        # Take the test orders back out of the sales rollups before deleting them
+        for order in Order.query.filter_by(user_id=customer_id).all():
+            if order.status != 'Cancelled':
+                record_order_sales(order, order_lines(order.id), sign=-1)
+            db.session.delete(order)
+        clear_cart(customer_id)
+        db.session.delete(db.session.get(User, customer_id))
+        med = db.session.get(Medicine, med_id)
+        med.quantity, med.price = original_qty, original_price
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_catalog_etag()
@@ -0,0 +1,67 @@
+from app import app, db, User, Category, category_cache
+from cache_utils import bump_version
+from sqlalchemy import event
+
+def verify_category_cache():
+    client = app.test_client()
+
+    with app.app_context():
+        print("--- Category Cache Verification ---")
+
+        statements = []
+        def count_query(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        category_cache.get() # Warm up
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+        try:
+            client.get('/about')
+            client.get('/login')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_query)
+
+        if not any('FROM category' in s for s in statements):
+            print("PASS: Nav rendering served from cache.")
+        else:
+            print("FAIL: Category table queried on render.")
+
+        # Simulate another worker adding a category and bumping the shared version
+        other = Category(name='Cache Test Category')
+        db.session.add(other)
+        bump_version('categories')
+        db.session.commit()
+
+        names = [c.name for c in category_cache.get()]
+        if 'Cache Test Category' not in names:
+            print("PASS: Local copy kept until TTL expires.")
+        else:
+            print("FAIL: Cache reloaded before TTL expiry.")
+
+        category_cache.expires_at = 0 # Fast-forward past TTL
+        names = [c.name for c in category_cache.get()]
+        if 'Cache Test Category' in names:
+            print("PASS: Version bump from another worker picked up after TTL.")
+        else:
+            print("FAIL: Stale categories after version bump.")
+
+        manager = User.query.filter_by(role='store_manager').first()
+
+    # Local invalidation through the route is immediate
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(manager.id)
+        sess['_fresh'] = True
+    client.post('/add_category', data={'name': 'Cache Test Category 2'})
+
+    with app.app_context():
+        names = [c.name for c in category_cache.get()]
+        if 'Cache Test Category 2' in names:
+            print("PASS: add_category invalidates the cache.")
+        else:
+            print("FAIL: add_category did not invalidate the cache.")
+
+        Category.query.filter(Category.name.like('Cache Test Category%')).delete(synchronize_session=False)
+        category_cache.invalidate()
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_category_cache()
@@ -0,0 +1,80 @@
+from app import app, db, User, Medicine, Order, OrderItem, dashboard_stats
+from sqlalchemy import event
+
+def verify_dashboard_stats():
+    client = app.test_client()
+
+    with app.app_context():
+        print("--- Dashboard Aggregate Verification ---")
+        manager = User.query.filter_by(role='store_manager').first()
+        med = Medicine.query.filter_by(user_id=manager.id).first()
+        if not med:
+            print("SKIP: Manager has no medicines.")
+            return
+        manager_id = med.user_id
+
+    def dashboard_query_count():
+        statements = []
+        def count_query(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', count_query)
+        try:
+            with client.session_transaction() as sess:
+                sess['_user_id'] = str(manager_id)
+                sess['_fresh'] = True
+            client.get('/dashboard')
+        finally:
+            with app.app_context():
+                event.remove(db.engine, 'before_cursor_execute', count_query)
+        return len(statements)
+
+    created = []
+    def add_orders(n, status):
+        with app.app_context():
+            for _ in range(n):
+                order = Order(store_manager_id=manager_id, total_amount=10, payment_method='COD', status=status)
+                order.items.append(OrderItem(medicine_id=med.id, medicine_name=med.name, quantity=1, price=10))
+                order.items.append(OrderItem(medicine_id=med.id, medicine_name=med.name, quantity=2, price=10))
+                db.session.add(order)
+                db.session.flush()
+                created.append(order.id)
+            db.session.commit()
+
+    try:
+        dashboard_query_count() # Warm up caches
+        add_orders(2, 'Placed')
+        small = dashboard_query_count()
+        add_orders(20, 'Delivered')
+        large = dashboard_query_count()
+        if small == large:
+            print(f"PASS: Dashboard issues {large} queries with 2 or 22 orders.")
+        else:
+            print(f"FAIL: Query count grew from {small} to {large}.")
+
+        with app.app_context():
+            meds = Medicine.query.filter_by(user_id=manager_id).all()
+            orders = Order.query.filter_by(store_manager_id=manager_id).all()
+            expected = {
+                'total': len(meds),
+                'available': len([m for m in meds if m.availability and m.quantity > 0]),
+                'out_of_stock': len([m for m in meds if m.quantity == 0]),
+                'expired': len([m for m in meds if m.expiry_status == 'Expired']),
+                'near_expiry': len([m for m in meds if m.expiry_status == 'Near Expiry']),
+                'total_orders': len(orders),
+                'pending_orders': len([o for o in orders if o.status in ['Placed', 'Packed']]),
+                'delivered_orders': len([o for o in orders if o.status == 'Delivered'])
+            }
+            actual = dashboard_stats(manager_id)
+            if actual == expected:
+                print(f"PASS: SQL aggregate matches Python counts {actual}.")
+            else:
+                print(f"FAIL: {actual} != {expected}")
+    finally:
+        with app.app_context():
+            for order_id in created:
+                db.session.delete(db.session.get(Order, order_id))
+            db.session.commit()
+
+if __name__ == "__main__":
+    verify_dashboard_stats()
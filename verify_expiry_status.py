@@ -0,0 +1,42 @@
+from app import app, db, Medicine, Category, hide_expired
+from models import NEAR_EXPIRY_DAYS
+from datetime import date, timedelta
+
+def verify_expiry_status():
+    with app.app_context():
+        print("--- Expiry Status (Python vs SQL) Verification ---")
+        cat = Category.query.first()
+        today = date.today()
+        offsets = [-30, -1, 0, 1, NEAR_EXPIRY_DAYS - 1, NEAR_EXPIRY_DAYS, NEAR_EXPIRY_DAYS + 1, 365]
+        meds = [Medicine(name=f'Expiry Probe {o}', price=1, quantity=1, category_id=cat.id,
+                         expiry_date=today + timedelta(days=o)) for o in offsets]
+        db.session.add_all(meds)
+        db.session.commit()
+        ids = [m.id for m in meds]
+
+        try:
+            sql_status = dict(db.session.query(Medicine.id, Medicine.expiry_status).filter(Medicine.id.in_(ids)))
+            mismatches = [(m.name, m.expiry_status, sql_status[m.id]) for m in meds if m.expiry_status != sql_status[m.id]]
+            if not mismatches:
+                print(f"PASS: SQL CASE matches the Python property on {len(meds)} boundary dates.")
+            else:
+                print(f"FAIL: {mismatches}")
+
+            grouped = dict(db.session.query(Medicine.expiry_status, db.func.count(Medicine.id))
+                           .filter(Medicine.id.in_(ids)).group_by(Medicine.expiry_status))
+            if grouped == {'Expired': 2, 'Near Expiry': 4, 'Safe': 2}:
+                print(f"PASS: Group by status in the database: {grouped}")
+            else:
+                print(f"FAIL: Grouped counts {grouped}")
+
+            visible = hide_expired(Medicine.query.filter(Medicine.id.in_(ids))).all()
+            if all(m.expiry_status != 'Expired' for m in visible) and len(visible) == len(meds) - 2:
+                print("PASS: hide_expired drops exactly the expired rows.")
+            else:
+                print(f"FAIL: hide_expired kept {[m.name for m in visible]}")
+        finally:
+            Medicine.query.filter(Medicine.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+
+if __name__ == "__main__":
+    verify_expiry_status()
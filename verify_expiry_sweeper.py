@@ -0,0 +1,87 @@
+from app import app, db, User, Medicine, Category, NearExpiryItem
+from expiry_sweeper import sweep_expiry
+from sqlalchemy import event
+from datetime import date, timedelta
+
+def verify_expiry_sweeper():
+    client = app.test_client()
+
+    with app.app_context():
+        print("--- Expiry Sweeper Verification ---")
+        manager = User.query.filter_by(role='store_manager').first()
+        cat = Category.query.first()
+        today = date.today()
+        probes = {'Sweep Probe Expired': -5, 'Sweep Probe Near': 10, 'Sweep Probe Safe': 365}
+        meds = [Medicine(name=name, price=1, quantity=3, category_id=cat.id, user_id=manager.id,
+                         expiry_date=today + timedelta(days=offset)) for name, offset in probes.items()]
+        db.session.add_all(meds)
+        db.session.commit()
+        ids = {m.name: m.id for m in meds}
+        manager_id = manager.id
+
+        statements = []
+        def count_query(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+        try:
+            result = sweep_expiry()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_query)
+
+        # UPDATE, DELETE, INSERT ... SELECT, plus the catalog version bump because stock expired
+        if len(statements) == 4:
+            print(f"PASS: Sweep ran as {len(statements)} set-based statements ({result['seconds'] * 1000:.1f} ms).")
+        else:
+            print(f"FAIL: Sweep issued {len(statements)} statements.")
+
+        availability = dict(db.session.query(Medicine.name, Medicine.availability).filter(Medicine.id.in_(ids.values())))
+        if availability == {'Sweep Probe Expired': False, 'Sweep Probe Near': True, 'Sweep Probe Safe': True}:
+            print("PASS: Only expired stock was marked unavailable.")
+        else:
+            print(f"FAIL: Availability after sweep {availability}")
+
+        worklist = dict(db.session.query(NearExpiryItem.medicine_name, NearExpiryItem.status)
+                        .filter(NearExpiryItem.medicine_id.in_(ids.values())))
+        if worklist == {'Sweep Probe Expired': 'Expired', 'Sweep Probe Near': 'Near Expiry'}:
+            print("PASS: Worklist holds the expired and near-expiry rows only.")
+        else:
+            print(f"FAIL: Worklist {worklist}")
+
+        if sweep_expiry()['expired_marked'] == 0:
+            print("PASS: A second sweep has nothing left to flip.")
+        else:
+            print("FAIL: Second sweep flipped rows again.")
+
+    # Customers no longer see (or can buy) swept stock
+    response = client.get('/medicines?search=Sweep Probe')
+    if b'Sweep Probe Expired' not in response.data and b'Sweep Probe Near' in response.data:
+        print("PASS: Catalog hides swept stock from customers.")
+    else:
+        print("FAIL: Swept stock still listed for customers.")
+
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(manager_id)
+        sess['_fresh'] = True
+    response = client.get('/dashboard')
+    if b'Expiry Worklist' in response.data and b'Sweep Probe Near' in response.data:
+        print("PASS: Dashboard renders the worklist.")
+    else:
+        print(f"FAIL: Dashboard returned {response.status_code} without the worklist.")
+
+    # Deleting a worklisted medicine must take its worklist row with it (foreign key)
+    response = client.get(f"/delete_medicine/{ids['Sweep Probe Near']}")
+    with app.app_context():
+        left = NearExpiryItem.query.filter_by(medicine_id=ids['Sweep Probe Near']).count()
+    if response.status_code == 302 and not left:
+        print("PASS: delete_medicine removes the medicine's worklist row.")
+    else:
+        print(f"FAIL: delete returned {response.status_code}, {left} worklist rows left.")
+
+    with app.app_context():
+        NearExpiryItem.query.filter(NearExpiryItem.medicine_id.in_(ids.values())).delete()
+        Medicine.query.filter(Medicine.id.in_(ids.values())).delete()
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_expiry_sweeper()
@@ -0,0 +1,97 @@
+import io
+import json
+import sys
+import time
+import tracemalloc
+from app import app, db, User, Medicine, Order, OrderItem
+from inventory_import import import_medicines
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+
+def make_orders(manager_id, medicine_id, lines, per_order=5):
+    orders = [{'user_id': manager_id, 'total_amount': 50, 'payment_method': 'COD', 'status': 'Delivered',
+               'store_manager_id': manager_id, 'full_name': 'Export Probe', 'city': 'Pune', 'pincode': '411001'}
+              for _ in range(lines // per_order)]
+    db.session.execute(insert(Order), orders)
+    order_ids = [o.id for o in Order.query.filter_by(store_manager_id=manager_id).with_entities(Order.id)]
+    db.session.execute(insert(OrderItem), [
+        {'order_id': order_id, 'medicine_id': medicine_id, 'medicine_name': 'Export Probe', 'quantity': 1, 'price': 10}
+        for order_id in order_ids for _ in range(per_order)])
+    db.session.commit()
+
+def consume(client, url):
+    """Reads a streamed response chunk by chunk; returns (first-chunk s, total s, bytes, peak MB, body or None)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, buffered=False)
+    first, size, keep = None, 0, []
+    for chunk in response.response:
+        first = first or time.perf_counter() - start
+        size += len(chunk)
+        if len(keep) < 3:
+            keep.append(chunk)
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    response.close()
+    return first, total, size, peak, keep
+
+def verify_export(lines=20000):
+    client = app.test_client()
+    with app.app_context():
+        print(f"--- Streaming Export Verification ({lines} order lines) ---")
+        manager = User.query.filter_by(username='export_tester').first()
+        if not manager:
+            manager = User(username='export_tester', password_hash=generate_password_hash('pass'), role='store_manager')
+            db.session.add(manager)
+            db.session.commit()
+        manager_id = manager.id
+        virat_id = User.query.filter_by(username='virat').first().id
+        medicine_id = Medicine.query.filter_by(user_id=virat_id).first().id
+        make_orders(manager_id, medicine_id, lines)
+
+    try:
+        with client.session_transaction() as sess:
+            sess['_user_id'] = str(manager_id)
+            sess['_fresh'] = True
+
+        first, total, size, peak, head = consume(client, '/export/orders.csv')
+        body_start = b''.join(head).decode()
+        if body_start.startswith('order_id,') and peak < 20:
+            print(f"PASS: Orders CSV streamed {size / 1e6:.1f} MB; first bytes after {first * 1000:.1f} ms, "
+                  f"done in {total:.2f}s, peak {peak:.1f} MB.")
+        else:
+            print(f"FAIL: First chunk {head[:1]}, peak {peak:.1f} MB")
+
+        _, total, size, peak, head = consume(client, '/export/orders.ndjson')
+        first_order = json.loads(b''.join(head).decode().splitlines()[0])
+        if len(first_order['items']) == 5 and peak < 20:
+            print(f"PASS: Orders NDJSON groups items per order ({total:.2f}s, peak {peak:.1f} MB).")
+        else:
+            print(f"FAIL: First NDJSON order {first_order}")
+
+        with client.session_transaction() as sess:
+            sess['_user_id'] = str(virat_id)
+        body = client.get('/export/medicines.csv').get_data(as_text=True)
+        with app.app_context():
+            result = import_medicines(io.StringIO(body), 'csv', virat_id)
+            count = Medicine.query.filter_by(user_id=virat_id).count()
+        if result.rejected == 0 and result.inserted == 0 and result.updated == count:
+            print(f"PASS: Medicines CSV re-imports cleanly ({count} rows updated, none rejected).")
+        else:
+            print(f"FAIL: Round trip gave {result}")
+
+        if client.get('/export/secrets.csv').status_code == 404:
+            print("PASS: Unknown export kinds are rejected.")
+        else:
+            print("FAIL: Unknown export kind served.")
+    finally:
+        with app.app_context():
+            order_ids = Order.query.filter_by(store_manager_id=manager_id).with_entities(Order.id)
+            OrderItem.query.filter(OrderItem.order_id.in_(order_ids.scalar_subquery())).delete(synchronize_session=False)
+            Order.query.filter_by(store_manager_id=manager_id).delete()
+            db.session.delete(db.session.get(User, manager_id))
+            db.session.commit()
+
+if __name__ == "__main__":
+    verify_export(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,86 @@
+from app import app, db, User, Medicine, Category, Order, OrderItem
+from maintenance import dedupe_medicines, reassign_medicines, enforce_status_mix
+from werkzeug.security import generate_password_hash
+from datetime import date, timedelta
+
+def verify_maintenance():
+    with app.app_context():
+        print("--- Set-Based Maintenance Verification ---")
+        cat = Category.query.first()
+        old = User.query.filter_by(username='maint_old').first() or User(
+            username='maint_old', password_hash=generate_password_hash('pass'), role='store_manager')
+        new = User.query.filter_by(username='maint_new').first() or User(
+            username='maint_new', password_hash=generate_password_hash('pass'), role='store_manager')
+        db.session.add_all([old, new])
+        db.session.commit()
+
+        today = date.today()
+        copies = [Medicine(name=name, price=1, quantity=qty, category_id=cat.id, user_id=old.id,
+                           expiry_date=today + timedelta(days=days))
+                  for name, qty, days in [('Maint Probe', 2, 30), ('maint probe ', 3, 400), ('MAINT PROBE', 5, 90)]]
+        other_store = Medicine(name='Maint Probe', price=1, quantity=7, category_id=cat.id, user_id=new.id,
+                               expiry_date=today + timedelta(days=10))
+        db.session.add_all(copies + [other_store])
+        db.session.flush()
+        order = Order(user_id=old.id, total_amount=1, payment_method='COD', store_manager_id=old.id)
+        db.session.add(order)
+        db.session.flush()
+        db.session.add(OrderItem(order_id=order.id, medicine_id=copies[0].id, medicine_name='Maint Probe', quantity=1, price=1))
+        db.session.commit()
+        ids = [m.id for m in copies]
+        keeper_id, other_id, old_id, new_id, order_id = copies[1].id, other_store.id, old.id, new.id, order.id
+
+        # Only the probe stores: the rest of the database is never touched
+        probe_stores = [old_id, new_id]
+        dry = dedupe_medicines(dry_run=True, user_ids=probe_stores)
+        if dry.dry_run and Medicine.query.filter(Medicine.id.in_(ids)).count() == 3 and dry.rows == 2:
+            print(f"PASS: Dry run reported {dry.rows} rows and changed nothing.")
+        else:
+            print("FAIL: Dry run modified data or miscounted.")
+
+        dedupe_medicines(chunk_size=50, user_ids=probe_stores) # Small chunks to exercise several ranges
+        db.session.expire_all()
+        left = Medicine.query.filter(Medicine.id.in_(ids)).all()
+        if len(left) == 1 and left[0].id == keeper_id and left[0].quantity == 10:
+            print("PASS: Kept the latest expiry with the summed quantity.")
+        else:
+            print(f"FAIL: Remaining rows {[(m.id, m.quantity) for m in left]}")
+
+        if db.session.get(Medicine, other_id).quantity == 7:
+            print("PASS: Another store's copy is left alone.")
+        else:
+            print("FAIL: Dedupe crossed store boundaries.")
+
+        if OrderItem.query.filter_by(order_id=order_id).one().medicine_id == keeper_id:
+            print("PASS: Order items were repointed to the kept row.")
+        else:
+            print("FAIL: Order item still references a deleted medicine.")
+
+        dedupe_medicines(per_store=False, user_ids=probe_stores)
+        db.session.expire_all()
+        if db.session.get(Medicine, keeper_id).quantity == 10 and db.session.get(Medicine, other_id).quantity == 7:
+            print("PASS: Global mode leaves duplicates shared by several stores alone.")
+        else:
+            print("FAIL: Global dedupe moved stock between stores.")
+
+        reassign_medicines(new_id, from_user_id=old_id)
+        db.session.expire_all()
+        if Medicine.query.filter_by(user_id=old_id).count() == 0 and db.session.get(Medicine, keeper_id).user_id == new_id:
+            print("PASS: Bulk reassign moved the store's medicines.")
+        else:
+            print("FAIL: Reassign left rows behind.")
+
+        mix = enforce_status_mix(dry_run=True, seed=1)
+        if mix.rows == Medicine.query.count():
+            print("PASS: Status-mix dry run covers every row.")
+        else:
+            print(f"FAIL: Status-mix dry run counted {mix.rows} rows.")
+
+        OrderItem.query.filter_by(order_id=order_id).delete()
+        Order.query.filter_by(id=order_id).delete()
+        Medicine.query.filter(Medicine.user_id.in_([old_id, new_id])).delete()
+        User.query.filter(User.id.in_([old_id, new_id])).delete()
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_maintenance()
@@ -0,0 +1,123 @@
+from datetime import date, timedelta
+from app import app, db, User, Medicine, Category, Order, OrderItem
+from models import summarize_order_items, StoreDailySales, MedicineDailySales, CategoryDailySales
+from migrate_order_summary import add_order_summary_columns
+from sqlalchemy import event, select, update
+from werkzeug.security import generate_password_hash
+
+ADDRESS = {
+    'payment_method': 'COD', 'full_name': 'Summary Tester', 'mobile_number': '1234567890',
+    'address_line1': '1 Street', 'area_landmark': 'Landmark', 'city': 'City', 'state': 'State', 'pincode': '123456'
+}
+
+def login(client, user_id):
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user_id)
+        sess['_fresh'] = True
+
+def verify_order_summary():
+    client = app.test_client()
+    with app.app_context():
+        print("--- Order Summary & History API Verification ---")
+        # Orders go to a throwaway store so no real stock or sales rollups are touched
+        manager = User.query.filter_by(username='summary_probe_store').first()
+        if not manager:
+            manager = User(username='summary_probe_store', password_hash=generate_password_hash('pass'), role='store_manager')
+            db.session.add(manager)
+            db.session.commit()
+        category_id = db.session.scalar(select(Category.id).order_by(Category.id).limit(1))
+        meds = [Medicine(name=f'Summary Probe {i}', price=10 + i, quantity=50, category_id=category_id,
+                         expiry_date=date.today() + timedelta(days=365), user_id=manager.id) for i in range(2)]
+        db.session.add_all(meds)
+        db.session.commit()
+        customer = User.query.filter_by(username='summary_tester').first()
+        if not customer:
+            customer = User(username='summary_tester', password_hash=generate_password_hash('pass'), role='customer')
+            db.session.add(customer)
+            db.session.commit()
+        customer_id, manager_id = customer.id, manager.id
+        cart = {meds[0].id: 2, meds[1].id: 1}
+        expected = summarize_order_items([(meds[0].name, 2), (meds[1].name, 1)])
+
+    login(client, customer_id)
+    for _ in range(2):
+        for med_id, qty in cart.items():
+            client.post(f'/add_to_cart/{med_id}', data={'quantity': qty})
+        client.post('/place_order', data=ADDRESS)
+
+    with app.app_context():
+        orders = Order.query.filter_by(user_id=customer_id).order_by(Order.id).all()
+        order_ids = [o.id for o in orders]
+        if len(orders) == 2 and all(o.item_count == 2 and o.items_summary == expected for o in orders):
+            print(f"PASS: place_order stored the summary: {expected!r}")
+        else:
+            print(f"FAIL: Stored summaries {[(o.item_count, o.items_summary) for o in orders]}")
+
+    page = client.get('/api/orders?per_page=1').get_json()
+    second = client.get(f"/api/orders?per_page=1&cursor={page['next_cursor']}").get_json()
+    if [page['orders'][0]['id'], second['orders'][0]['id']] == order_ids[::-1]:
+        print("PASS: /api/orders pages newest first with a cursor.")
+    else:
+        print(f"FAIL: Pages {page} / {second}")
+
+    detail = client.get(f'/api/orders/{order_ids[0]}').get_json()
+    if len(detail['items']) == 2 and detail['address']['city'] == 'City':
+        print("PASS: Order details load on demand with items.")
+    else:
+        print(f"FAIL: Detail {detail}")
+
+    statements = []
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    login(client, manager_id)
+    client.get('/dashboard') # Warm up caches
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+    try:
+        body = client.get('/dashboard').get_data(as_text=True)
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'before_cursor_execute', count_query)
+    if expected in body and not any('FROM order_item' in s or 'JOIN order_item' in s for s in statements):
+        print(f"PASS: Dashboard order table rendered without touching order_item ({len(statements)} queries).")
+    else:
+        print("FAIL: Dashboard queried order_item or missed the summary.")
+
+    with app.app_context():
+        stranger = User(username='summary_stranger', password_hash=generate_password_hash('pass'), role='customer')
+        db.session.add(stranger)
+        db.session.commit()
+        stranger_id = stranger.id
+    login(client, stranger_id)
+    if client.get(f'/api/orders/{order_ids[0]}').status_code == 404 and not client.get('/api/orders').get_json()['orders']:
+        print("PASS: Customers cannot read other people's orders.")
+    else:
+        print("FAIL: Another customer's order was readable.")
+
+    with app.app_context():
+        db.session.execute(update(Order).where(Order.id.in_(order_ids)).values(item_count=None, items_summary=None))
+        db.session.commit()
+    add_order_summary_columns()
+    with app.app_context():
+        if all(db.session.get(Order, i).items_summary == expected for i in order_ids):
+            print("PASS: Migration backfills summaries for old orders.")
+        else:
+            print("FAIL: Backfill did not restore summaries.")
+
+        long_summary = summarize_order_items([(f'Medicine number {i}', 1) for i in range(60)])
+        if len(long_summary) <= 500 and long_summary.endswith('more'):
+            print("PASS: Long summaries are cut with a '+N more' suffix.")
+        else:
+            print(f"FAIL: Long summary {len(long_summary)} chars")
+
+        OrderItem.query.filter(OrderItem.order_id.in_(order_ids)).delete()
+        Order.query.filter(Order.id.in_(order_ids)).delete()
+        for model in (StoreDailySales, MedicineDailySales, CategoryDailySales):
+            model.query.filter_by(store_manager_id=manager_id).delete()
+        Medicine.query.filter_by(user_id=manager_id).delete()
+        User.query.filter(User.id.in_([customer_id, stranger_id, manager_id])).delete()
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_order_summary()
@@ -0,0 +1,75 @@
+import re
+from app import app, db, Medicine, Order
+from pagination import paginate_keyset, paginate_ranked
+from datetime import datetime
+
+def collect_pages(fetch):
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = fetch(cursor)
+        seen.extend(page.items)
+        pages += 1
+        if not page.next_cursor or pages > 1000:
+            return seen, pages
+        cursor = page.next_cursor
+
+def verify_pagination():
+    with app.app_context():
+        print("--- Keyset Pagination Verification ---")
+
+        total = Medicine.query.count()
+        seen, pages = collect_pages(lambda c: paginate_keyset(Medicine.query, [Medicine.name, Medicine.id], c, 7))
+        ids = [m.id for m in seen]
+        if len(ids) == total and len(set(ids)) == total:
+            print(f"PASS: {total} medicines walked in {pages} pages, no gaps or repeats.")
+        else:
+            print(f"FAIL: Walked {len(ids)} rows ({len(set(ids))} unique) of {total}.")
+
+        if [(m.name, m.id) for m in seen] == sorted((m.name, m.id) for m in seen):
+            print("PASS: Pages ordered by (name, id).")
+        else:
+            print("FAIL: Pages out of order.")
+
+        # Orders sharing the same timestamp must still page cleanly (id breaks ties)
+        stamp = datetime(2020, 1, 1, 12, 0, 0)
+        orders = [Order(total_amount=1, payment_method='COD', order_date=stamp, status='Placed') for _ in range(5)]
+        db.session.add_all(orders)
+        db.session.commit()
+        try:
+            query = Order.query.filter(Order.order_date == stamp)
+            seen, _ = collect_pages(lambda c: paginate_keyset(query, [Order.order_date, Order.id], c, 2, descending=True))
+            if [o.id for o in seen] == sorted((o.id for o in orders), reverse=True):
+                print("PASS: Descending (order_date, id) pages handle timestamp ties.")
+            else:
+                print(f"FAIL: Order pages returned {[o.id for o in seen]}")
+        finally:
+            for o in orders:
+                db.session.delete(o)
+            db.session.commit()
+
+        seen, _ = collect_pages(lambda c: paginate_ranked(Medicine.query.order_by(Medicine.id), c, 10))
+        if len(seen) == min(total, 1000) and len({m.id for m in seen}) == len(seen):
+            print("PASS: Ranked (offset) pagination walks search results.")
+        else:
+            print(f"FAIL: Ranked pagination returned {len(seen)} rows.")
+
+        if paginate_keyset(Medicine.query, [Medicine.name, Medicine.id], 'garbage!!', 5).items:
+            print("PASS: Garbled cursor falls back to the first page.")
+        else:
+            print("FAIL: Garbled cursor broke the page.")
+
+    client = app.test_client()
+    response = client.get('/medicines?per_page=10')
+    cards = response.data.count(b'class="medicine-card"')
+    match = re.search(rb'href="([^"]*cursor=[^"]*)"', response.data)
+    if cards == 10 and match:
+        next_page = client.get(match.group(1).decode().replace('&amp;', '&'))
+        if next_page.status_code == 200 and b'First Page' in next_page.data:
+            print("PASS: /medicines renders a bounded page with a working next link.")
+        else:
+            print("FAIL: Next page link broken.")
+    else:
+        print(f"FAIL: /medicines rendered {cards} cards, next link: {bool(match)}")
+
+if __name__ == "__main__":
+    verify_pagination()
@@ -0,0 +1,52 @@
+import contextlib
+import io
+import json
+import os
+
+os.environ['PERF_MONITOR'] = '1'
+os.environ['PERF_MAX_QUERIES'] = '3'
+from app import app, User
+
+def verify_perf_monitor():
+    client = app.test_client()
+    print("--- Perf Monitor Verification ---")
+    with app.app_context():
+        manager_id = User.query.filter_by(username='virat').first().id
+
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        response = client.get('/medicines')
+    queries = int(response.headers.get('X-DB-Queries', -1))
+    if queries > 0 and response.headers.get('Server-Timing', '').startswith('db;dur='):
+        print(f"PASS: /medicines reports {queries} queries ({response.headers['Server-Timing']}).")
+    else:
+        print(f"FAIL: Missing perf headers {dict(response.headers)}")
+
+    record = json.loads(log.getvalue().strip().splitlines()[-1])
+    if record['perf'] == 'medicines' and record['queries'] == queries:
+        print("PASS: One structured log line per request.")
+    else:
+        print(f"FAIL: Log line {record}")
+
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(manager_id)
+        sess['_fresh'] = True
+    with contextlib.redirect_stdout(log):
+        for _ in range(3):
+            response = client.get('/dashboard')
+    last = json.loads(log.getvalue().strip().splitlines()[-1])
+    if 'many-queries' in response.headers.get('X-Perf-Flags', '') and last.get('slowest_query'):
+        print(f"PASS: Requests over PERF_MAX_QUERIES are flagged (slowest: {last['slowest_query_ms']} ms).")
+    else:
+        print(f"FAIL: Dashboard not flagged: {last}")
+
+    summary = client.get('/__perf').get_json()['endpoints']
+    dashboard = summary.get('dashboard', {})
+    if dashboard.get('requests') == 3 and dashboard['p95_ms'] >= dashboard['p50_ms'] and 'perf_summary' not in summary:
+        print(f"PASS: /__perf summary: dashboard p50 {dashboard['p50_ms']} ms, p95 {dashboard['p95_ms']} ms, "
+              f"{dashboard['p50_queries']} queries.")
+    else:
+        print(f"FAIL: Summary {summary}")
+
+if __name__ == "__main__":
+    verify_perf_monitor()
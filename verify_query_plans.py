@@ -0,0 +1,77 @@
+import sys
+from app import app, db, Medicine, Category, Order, OrderItem
+from datetime import date, timedelta
+from sqlalchemy import tuple_
+
+def explain(stmt):
+    """Returns the database's plan lines for a statement (SQLite or Postgres)."""
+    conn = db.session.connection()
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={'render_postcompile': True})
+    params = compiled.construct_params()
+
+    if conn.dialect.name == 'sqlite':
+        args = tuple(params[name] for name in compiled.positiontup)
+        rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + str(compiled), args).fetchall()
+        return [row[-1] for row in rows]
+
+    # Small tables make Postgres prefer seq scans; forbid them to prove an index path exists
+    conn.exec_driver_sql('SET LOCAL enable_seqscan = off')
+    rows = conn.exec_driver_sql('EXPLAIN ' + str(compiled), params).fetchall()
+    return [row[0] for row in rows]
+
+def full_scans(plan, dialect):
+    if dialect == 'sqlite':
+        # "SCAN t" walks the whole table; "SCAN t USING INDEX" walks an index in order
+        return [line for line in plan if line.startswith('SCAN ') and 'USING' not in line
+                and 'CONSTANT ROW' not in line]
+    return [line for line in plan if 'Seq Scan' in line]
+
+def verify_query_plans():
+    with app.app_context():
+        print("--- Query Plan Verification ---")
+        dialect = db.engine.dialect.name
+        manager_id, today = 1, date.today()
+        page = 25
+
+        checks = [
+            ("Catalog page (name, id)",
+             Medicine.query.order_by(Medicine.name, Medicine.id).limit(page)),
+            ("Manager catalog / dashboard inventory",
+             Medicine.query.filter(Medicine.user_id == manager_id).order_by(Medicine.name, Medicine.id).limit(page)),
+            ("Catalog deep page (keyset cursor)",
+             Medicine.query.filter(tuple_(Medicine.name, Medicine.id) > tuple_('M', 50))
+             .order_by(Medicine.name, Medicine.id).limit(page)),
+            ("Healthcare category page",
+             Medicine.query.join(Category).filter(Category.name == 'Must Haves').order_by(Medicine.name, Medicine.id).limit(page)),
+            ("Medicine type filter",
+             Medicine.query.filter(Medicine.medicine_type == 'Syrup').order_by(Medicine.name, Medicine.id).limit(page)),
+            ("Expired stock",
+             Medicine.query.filter(Medicine.expiry_date < today)),
+            ("Near-expiry window",
+             Medicine.query.filter(Medicine.expiry_date.between(today, today + timedelta(days=60)))),
+            ("Dashboard orders (order_date, id)",
+             Order.query.filter(Order.store_manager_id == manager_id)
+             .order_by(Order.order_date.desc(), Order.id.desc()).limit(page)),
+            ("Customer orders",
+             Order.query.filter(Order.user_id == manager_id)),
+            ("Order items (selectinload)",
+             OrderItem.query.filter(OrderItem.order_id.in_([1, 2, 3]))),
+        ]
+
+        failures = 0
+        for label, query in checks:
+            plan = explain(query.statement)
+            scans = full_scans(plan, dialect)
+            sorts = [line for line in plan if 'TEMP B-TREE FOR ORDER BY' in line]
+            if scans or sorts:
+                failures += 1
+                print(f"FAIL: {label}: {'; '.join(scans + sorts)}")
+            else:
+                print(f"PASS: {label}: {'; '.join(plan)}")
+            db.session.rollback()
+
+        print(f"\nQuery plans: {len(checks) - failures}/{len(checks)} use indexes.")
+        return failures
+
+if __name__ == "__main__":
+    sys.exit(1 if verify_query_plans() else 0)
@@ -0,0 +1,57 @@
+from app import app, db, Medicine, Category
+from search_index import apply_search, get_search_backend
+from datetime import date, timedelta
+
+def verify_search_index():
+    with app.app_context():
+        print("--- Search Index Verification ---")
+        backend = get_search_backend()
+        print(f"Backend: {backend.name}")
+
+        cat = Category.query.first()
+        expiry = date.today() + timedelta(days=365)
+        by_name = Medicine(name='Zyxolin 500mg', price=10, quantity=5, expiry_date=expiry,
+                           category_id=cat.id, composition='Active Ingredient: Paracetamol 500 mg')
+        by_composition = Medicine(name='Fever Kit', price=10, quantity=5, expiry_date=expiry,
+                                  category_id=cat.id, composition='Active Ingredient: Zyxolin 250 mg')
+        db.session.add_all([by_name, by_composition])
+        db.session.commit()
+
+        def search(q):
+            return [m.name for m in apply_search(Medicine.query, q).all()]
+
+        try:
+            results = search('zyxolin')
+            if results == ['Zyxolin 500mg', 'Fever Kit']:
+                print("PASS: Name and composition hits found, name hit ranked first.")
+            else:
+                print(f"FAIL: Unexpected ranking {results}")
+
+            if 'Zyxolin 500mg' in search('zyxo'):
+                print("PASS: Prefix search while typing.")
+            else:
+                print("FAIL: Prefix search found nothing.")
+
+            if search('zyxolin 500') == ['Zyxolin 500mg']:
+                print("PASS: Multi-word search requires every word.")
+            else:
+                print(f"FAIL: Multi-word search returned {search('zyxolin 500')}")
+
+            by_name.name = 'Qwertamol 500mg'
+            db.session.commit()
+            if 'Qwertamol 500mg' in search('qwertamol') and search('zyxolin') == ['Fever Kit']:
+                print("PASS: Index follows updates.")
+            else:
+                print("FAIL: Index is stale after update.")
+        finally:
+            db.session.delete(by_name)
+            db.session.delete(by_composition)
+            db.session.commit()
+
+        if not search('qwertamol') and not search('zyxolin'):
+            print("PASS: Index follows deletes.")
+        else:
+            print("FAIL: Deleted medicines still searchable.")
+
+if __name__ == "__main__":
+    verify_search_index()
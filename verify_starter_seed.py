@@ -0,0 +1,54 @@
+import threading
+import time
+from app import app, db, User, Medicine, StarterSeed, seed_starter_data
+from werkzeug.security import generate_password_hash
+
+def verify_starter_seed():
+    with app.app_context():
+        print("--- Starter Seed Verification ---")
+        user = User.query.filter_by(username='seed_tester').first()
+        if user:
+            Medicine.query.filter_by(user_id=user.id).delete()
+            StarterSeed.query.filter_by(user_id=user.id).delete()
+            db.session.delete(user)
+        user = User(username='seed_tester', password_hash=generate_password_hash('pass'), role='store_manager')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+    # Two logins at the same moment must seed exactly once
+    durations = []
+    def login():
+        client = app.test_client()
+        start = time.perf_counter()
+        client.post('/manager-login', data={'username': 'seed_tester', 'password': 'pass'})
+        durations.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=login) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with app.app_context():
+        names = [name for (name,) in db.session.query(Medicine.name).filter_by(user_id=user_id)]
+        if names and len(names) == len(set(names)):
+            print(f"PASS: Concurrent logins seeded {len(names)} medicines once (slowest login {max(durations) * 1000:.0f} ms).")
+        else:
+            print(f"FAIL: {len(names)} rows, {len(set(names))} unique.")
+
+        # A manager who clears their inventory is not re-seeded on the next login
+        Medicine.query.filter_by(user_id=user_id).delete()
+        db.session.commit()
+        seed_starter_data(user_id)
+        if Medicine.query.filter_by(user_id=user_id).count() == 0:
+            print("PASS: Seeding is idempotent per manager.")
+        else:
+            print("FAIL: Manager was seeded twice.")
+
+        StarterSeed.query.filter_by(user_id=user_id).delete()
+        db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_starter_seed()
@@ -0,0 +1,87 @@
+import threading
+from app import app, db, User, Medicine, Order
+from cart_utils import reserve_stock, add_cart_item, clear_cart
+from werkzeug.security import generate_password_hash
+
+ADDRESS = {
+    'payment_method': 'COD', 'full_name': 'Stock Tester', 'mobile_number': '1234567890',
+    'address_line1': '1 Street', 'area_landmark': 'Landmark', 'city': 'City', 'state': 'State', 'pincode': '123456'
+}
+
+def verify_stock_reservation():
+    with app.app_context():
+        print("--- Stock Reservation Verification ---")
+        meds = Medicine.query.order_by(Medicine.id).limit(2).all()
+        if len(meds) < 2:
+            print("SKIP: Need at least two medicines.")
+            return
+        a, b = meds
+        original = {a.id: a.quantity, b.id: b.quantity}
+        a.quantity, b.quantity = 5, 1
+        db.session.commit()
+
+        reserved = reserve_stock({a.id: 3, b.id: 2})
+        db.session.commit()
+        db.session.expire_all()
+        if reserved == {a.id} and a.quantity == 2 and b.quantity == 1:
+            print("PASS: Only lines with enough stock are decremented.")
+        else:
+            print(f"FAIL: reserved={reserved}, quantities=({a.quantity}, {b.quantity})")
+
+        if reserve_stock({a.id: -10}) == set():
+            print("PASS: Non-positive quantities are rejected.")
+        else:
+            print("FAIL: Negative quantity reserved stock.")
+        db.session.rollback()
+
+        users = []
+        for i in range(6):
+            user = User.query.filter_by(username=f'stock_tester_{i}').first()
+            if not user:
+                user = User(username=f'stock_tester_{i}', password_hash=generate_password_hash('pass'), role='customer')
+                db.session.add(user)
+            users.append(user)
+        a.quantity = 3
+        db.session.commit()
+        user_ids, med_id = [u.id for u in users], a.id
+        for user_id in user_ids:
+            clear_cart(user_id)
+            add_cart_item(user_id, med_id, 1)
+        db.session.commit()
+
+    # Six customers race for 3 units, 1 unit each
+    results = []
+    def checkout(user_id):
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['_user_id'] = str(user_id)
+            sess['_fresh'] = True
+        response = client.post('/place_order', data=ADDRESS)
+        results.append(response.status_code == 200)
+
+    threads = [threading.Thread(target=checkout, args=(user_id,)) for user_id in user_ids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with app.app_context():
+        remaining = db.session.get(Medicine, med_id).quantity
+        placed = Order.query.filter(Order.user_id.in_(user_ids)).count()
+        if results.count(True) == 3 and placed == 3 and remaining == 0:
+            print("PASS: 6 concurrent checkouts for 3 units placed exactly 3 orders.")
+        else:
+            print(f"FAIL: succeeded={results.count(True)}, orders={placed}, remaining={remaining}")
+
+        # Cleanup
+        for order in Order.query.filter(Order.user_id.in_(user_ids)).all():
+            db.session.delete(order)
+        for user_id in user_ids:
+            clear_cart(user_id)
+            db.session.delete(db.session.get(User, user_id))
+        for mid, qty in original.items():
+            db.session.get(Medicine, mid).quantity = qty
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_stock_reservation()
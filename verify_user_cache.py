@@ -0,0 +1,77 @@
+from app import app, db, User, CustomerQuery, user_cache
+from cache_utils import bump_version
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+
+def verify_user_cache():
+    client = app.test_client()
+
+    with app.app_context():
+        print("--- User Cache Verification ---")
+        user = User.query.filter_by(username='cache_tester').first()
+        if not user:
+            user = User(username='cache_tester', password_hash=generate_password_hash('pass'), role='customer')
+            db.session.add(user)
+            db.session.commit()
+        user_id = user.id
+
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user_id)
+        sess['_fresh'] = True
+
+    statements = []
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    client.get('/about') # Warm up
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+    try:
+        for _ in range(5):
+            client.get('/about')
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'before_cursor_execute', count_query)
+
+    if not any('FROM user' in s for s in statements):
+        print("PASS: 5 authenticated requests served without a user SELECT.")
+    else:
+        print(f"FAIL: {sum('FROM user' in s for s in statements)} user SELECTs issued.")
+
+    # Requests that commit must not break the cached (detached) user
+    response = client.post('/support', data={'name': 'a', 'email': 'a@b.c', 'subject': 's', 'message': 'm'},
+                           follow_redirects=True)
+    if response.status_code == 200 and b'cache_tester' in response.data:
+        print("PASS: Cached user survives a committing request.")
+    else:
+        print(f"FAIL: Committing request returned {response.status_code}.")
+
+    # Another process (e.g. upgrade_user.py) changes the role and bumps the version
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        user.role = 'store_manager'
+        bump_version('users') # What user_cache.invalidate() does in the other process
+        db.session.commit()
+
+    response = client.get('/dashboard')
+    if response.status_code == 302:
+        print("PASS: Cached role kept until TTL expires.")
+    else:
+        print(f"FAIL: Dashboard returned {response.status_code} before TTL expiry.")
+
+    user_cache.checked_until = 0 # Fast-forward past TTL
+
+    response = client.get('/dashboard')
+    if response.status_code == 200:
+        print("PASS: Role change picked up after invalidation.")
+    else:
+        print(f"FAIL: Dashboard returned {response.status_code} after upgrade.")
+
+    with app.app_context():
+        CustomerQuery.query.filter_by(email='a@b.c').delete()
+        db.session.delete(db.session.get(User, user_id))
+        user_cache.invalidate(user_id)
+        db.session.commit()
+
+if __name__ == "__main__":
+    verify_user_cache()